@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+from todo import BACKENDS, DEFAULT_FILES, DEFAULT_SOCKET, TodoManager, make_storage
+
+TODO = HERE / 'todo.py'
+CLIENT = HERE / 'todo_client.py'
+
+# Each mode runs the same commands: todo.py itself, the thin client with no
+# daemon (so it falls back to todo.py), and the thin client with a daemon
+MODES = ('direct', 'fallback', 'daemon')
+
+class LatencyBenchmark:
+    def __init__(self, workdir, backend='json', runs=20):
+        self.workdir = Path(workdir)
+        self.backend = backend
+        self.runs = runs
+        self.env = dict(os.environ, TODO_BACKEND=backend)
+        self.env.pop('TODO_SOCKET', None)
+
+    def seed(self, count):
+        """Start each size from a fresh file holding count tasks."""
+        if self.workdir.exists():
+            shutil.rmtree(self.workdir)
+        self.workdir.mkdir(parents=True)
+        storage = make_storage(self.backend, str(self.workdir / DEFAULT_FILES[self.backend]))
+        storage.apply([('add', TodoManager.new_task(f"Seeded task {i}")) for i in range(count)])
+        # The id the next added task gets
+        return count + 1
+
+    def call(self, script, args):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(script)] + args, cwd=self.workdir, env=self.env,
+                       stdout=subprocess.DEVNULL, check=True)
+        return time.perf_counter() - start
+
+    def start_daemon(self):
+        process = subprocess.Popen([sys.executable, str(TODO), 'serve'], cwd=self.workdir, env=self.env,
+                                   stdout=subprocess.DEVNULL)
+        socket_path = self.workdir / DEFAULT_SOCKET
+        deadline = time.monotonic() + 60
+        while not socket_path.exists():
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError("the todo daemon did not start")
+            time.sleep(0.01)
+        return process
+
+    def run_mode(self, mode, first_id):
+        """Time add, list, complete and delete, each self.runs times."""
+        script = TODO if mode == 'direct' else CLIENT
+        timings = {'add': [], 'list': [], 'complete': [], 'delete': []}
+        for i in range(self.runs):
+            timings['add'].append(self.call(script, ['add', f"Benchmark task {i}"]))
+            timings['list'].append(self.call(script, ['list', '--pending', '--limit', '20']))
+        # Complete then delete the tasks this mode added
+        for task_id in range(first_id, first_id + self.runs):
+            timings['complete'].append(self.call(script, ['complete', str(task_id)]))
+            timings['delete'].append(self.call(script, ['delete', str(task_id)]))
+        return {command: {'median_ms': statistics.median(values) * 1000,
+                          'p95_ms': statistics.quantiles(values, n=20)[-1] * 1000}
+                for command, values in timings.items()}
+
+    def run_size(self, count):
+        print(f"\n📚 {count} tasks, {self.backend} backend, {self.runs} runs per command")
+        results = {}
+        for mode in MODES:
+            next_id = self.seed(count)
+            daemon = self.start_daemon() if mode == 'daemon' else None
+            try:
+                results[mode] = self.run_mode(mode, next_id)
+            finally:
+                if daemon:
+                    daemon.terminate()
+                    daemon.wait()
+            print(f"   {mode:<9}" + "".join(f"  {command} {timing['median_ms']:>7.1f} ms"
+                                           for command, timing in results[mode].items()))
+        return {'tasks': count, 'modes': results}
+
+    def run(self, sizes):
+        report = {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'settings': {'backend': self.backend, 'runs': self.runs},
+            'runs': [self.run_size(count) for count in sizes],
+        }
+        shutil.rmtree(self.workdir, ignore_errors=True)
+        return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-command latency of todo.py with and without the daemon")
+    parser.add_argument('--tasks', type=int, nargs='+', default=[100, 10000], help='Task list sizes to benchmark')
+    parser.add_argument('--backend', choices=BACKENDS, default='json', help='Storage backend')
+    parser.add_argument('--runs', type=int, default=20, help='Calls per command and mode (at least 2)')
+    parser.add_argument('--workdir', default='latency', help='Scratch directory for the task files')
+    parser.add_argument('--json', metavar='FILE', help='Save the machine-readable report to FILE')
+
+    args = parser.parse_args()
+
+    report = LatencyBenchmark(args.workdir, backend=args.backend, runs=args.runs).run(args.tasks)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from todo import BACKENDS, DEFAULT_FILES, StorageError, TodoManager, make_storage
+
+def task(task_id, description):
+    return {"id": task_id, "description": description, "completed": False, "created_at": "2024-01-01T00:00:00"}
+
+# What older versions left after: add a, b, c; delete 1; add d
+DUPLICATE_IDS = [task(2, "b"), task(3, "c"), task(3, "d")]
+
+class RegressionCheck:
+    def __init__(self):
+        self.failures = []
+
+    def check(self, name, condition):
+        print(f"   {'✅' if condition else '❌'} {name}")
+        if not condition:
+            self.failures.append(name)
+
+    def open(self, workdir, backend):
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            storage = make_storage(backend, str(workdir / DEFAULT_FILES[backend]))
+            storage.tasks()
+        return storage
+
+    def duplicate_ids(self, workdir, backend):
+        """Tasks sharing an id in todos.json all survive loading, migration and the next write."""
+        (workdir / "todos.json").write_text(json.dumps(DUPLICATE_IDS))
+        storage = self.open(workdir, backend)
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            storage.apply([("add", TodoManager.new_task("e"))])
+        tasks = self.open(workdir, backend).tasks()
+        ids = [task["id"] for task in tasks]
+        self.check(f"{backend}: tasks sharing an id are all kept",
+                   sorted(task["description"] for task in tasks) == ["b", "c", "d", "e"] and len(ids) == len(set(ids)))
+
+    def duplicate_ids_page(self, workdir, backend):
+        """Listing a page shows the same ids that complete and delete act on."""
+        (workdir / "todos.json").write_text(json.dumps(DUPLICATE_IDS))
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            page = make_storage(backend, str(workdir / DEFAULT_FILES[backend])).page(limit=3)
+        self.check(f"{backend}: a page renumbers tasks sharing an id",
+                   [(task["id"], task["description"]) for task in page] == [(2, "b"), (3, "c"), (4, "d")])
+
+    def ids_after_delete(self, workdir, backend):
+        """Adding after a deletion never overwrites a live task."""
+        storage = self.open(workdir, backend)
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            storage.apply([("add", TodoManager.new_task(name)) for name in "abc"])
+            storage.apply([("delete", 1)])
+            storage.apply([("add", TodoManager.new_task("d"))])
+        tasks = self.open(workdir, backend).tasks()
+        self.check(f"{backend}: add after delete keeps every task",
+                   sorted(task["description"] for task in tasks) == ["b", "c", "d"])
+
+    def failed_sqlite_migration(self, workdir):
+        """A migration that fails is retried by the next call instead of leaving an empty database."""
+        (workdir / "todos.json").write_text('[{"id": 1, "descr')
+        try:
+            self.open(workdir, "sqlite")
+            failed = False
+        except StorageError:
+            failed = True
+        (workdir / "todos.json").write_text(json.dumps(DUPLICATE_IDS))
+        tasks = self.open(workdir, "sqlite").tasks()
+        self.check("sqlite: a failed migration is retried", failed and len(tasks) == 3)
+
+    def failed_batch_write(self, workdir, backend):
+        """Batched changes stay queued when the holder of the lock fails to write them."""
+        filename = str(workdir / DEFAULT_FILES[backend])
+        waiting = make_storage(backend, filename, batch=True)
+        waiting.queue.push([("add", TodoManager.new_task("queued"))])
+        (workdir / "todos.json").write_text('[{"id": 1, "descr')
+        try:
+            make_storage(backend, filename, batch=True).apply([("add", TodoManager.new_task("holder"))])
+            failed = False
+        except StorageError:
+            failed = True
+        (workdir / "todos.json").write_text("[]")
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            waiting.apply([("add", TodoManager.new_task("retry"))])
+        tasks = self.open(workdir, backend).tasks()
+        self.check(f"{backend}: a failed batch write keeps the queue",
+                   failed and sorted(task["description"] for task in tasks) == ["holder", "queued", "retry"])
+
+    def run(self):
+        checks = [(self.duplicate_ids, backend) for backend in BACKENDS]
+        checks.append((self.duplicate_ids_page, "json"))
+        checks += [(self.ids_after_delete, backend) for backend in BACKENDS]
+        checks.append((self.failed_batch_write, "json"))
+        checks.append((self.failed_sqlite_migration, None))
+        print("\n🔍 Todo storage regression checks")
+        for check, backend in checks:
+            workdir = Path(tempfile.mkdtemp(prefix="todo-check-"))
+            try:
+                check(workdir, backend) if backend else check(workdir)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+        return not self.failures
+
+def main():
+    if not RegressionCheck().run():
+        print("\n❌ Regression checks failed")
+        sys.exit(1)
+    print("\n✅ All regression checks passed")
+
+if __name__ == "__main__":
+    main()
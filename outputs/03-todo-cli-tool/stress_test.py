@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import multiprocessing
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from todo import BACKENDS, DEFAULT_FILES, TodoManager, make_storage
+
+def writer(backend, filename, batch, number, ops, start):
+    """Add ops tasks, each through a fresh TodoManager like a separate todo.py call."""
+    start.wait()
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for i in range(ops):
+            TodoManager(storage=make_storage(backend, filename, batch=batch)).add_task(f"writer {number} task {i}")
+
+class StressTest:
+    def __init__(self, workdir, ops=100):
+        self.workdir = Path(workdir)
+        self.ops = ops
+
+    def reset(self):
+        if self.workdir.exists():
+            shutil.rmtree(self.workdir)
+        self.workdir.mkdir(parents=True)
+
+    def run_once(self, backend, writers, batch):
+        """Run concurrent writers against a fresh file and check that no add was lost."""
+        self.reset()
+        filename = str(self.workdir / DEFAULT_FILES[backend])
+        start = multiprocessing.Event()
+        processes = [multiprocessing.Process(target=writer, args=(backend, filename, batch, number, self.ops, start))
+                     for number in range(writers)]
+        for process in processes:
+            process.start()
+        began = time.perf_counter()
+        start.set()
+        for process in processes:
+            process.join()
+        wall = time.perf_counter() - began
+        failed = sum(1 for process in processes if process.exitcode != 0)
+
+        tasks = make_storage(backend, filename).tasks()
+        expected = {f"writer {number} task {i}" for number in range(writers) for i in range(self.ops)}
+        descriptions = {task["description"] for task in tasks}
+        ids = [task["id"] for task in tasks]
+        return {
+            'backend': backend,
+            'batch': batch,
+            'writers': writers,
+            'ops': writers * self.ops,
+            'wall': wall,
+            'ops_per_sec': writers * self.ops / wall if wall else 0.0,
+            'lost': len(expected - descriptions),
+            'duplicate_ids': len(ids) - len(set(ids)),
+            'failed_writers': failed,
+        }
+
+    def run(self, backends, writer_counts, modes):
+        results = []
+        for backend in backends:
+            print(f"\n🗄️  {backend} backend, {self.ops} adds per writer")
+            for batch in modes:
+                if batch and backend == "sqlite":
+                    continue
+                for writers in writer_counts:
+                    result = self.run_once(backend, writers, batch)
+                    results.append(result)
+                    status = "✅" if not (result['lost'] or result['duplicate_ids'] or result['failed_writers']) else "❌"
+                    print(f"   {status} {'batch' if batch else 'single':<7} {writers:>3} writers  "
+                          f"{result['ops_per_sec']:>9.1f} adds/s  {result['wall']:>7.2f} s  "
+                          f"(lost {result['lost']}, duplicate ids {result['duplicate_ids']})")
+        shutil.rmtree(self.workdir, ignore_errors=True)
+        return {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'ops_per_writer': self.ops,
+            'results': results,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure todo.py write throughput with concurrent writers")
+    parser.add_argument('--writers', type=int, nargs='+', default=[1, 2, 4, 8], help='Numbers of concurrent writer processes')
+    parser.add_argument('--ops', type=int, default=100, help='Tasks added by each writer')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS), help='Backends to test')
+    parser.add_argument('--no-batch', action='store_true', help="Skip the runs with --batch writers")
+    parser.add_argument('--workdir', default='stress', help='Scratch directory for the task files')
+    parser.add_argument('--json', metavar='FILE', help='Save the machine-readable report to FILE')
+
+    args = parser.parse_args()
+
+    modes = [False] if args.no_batch else [False, True]
+    report = StressTest(args.workdir, ops=args.ops).run(args.backends, args.writers, modes)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to {args.json}")
+
+    if any(result['lost'] or result['duplicate_ids'] or result['failed_writers'] for result in report['results']):
+        print("\n❌ Concurrent writers lost updates")
+        sys.exit(1)
+    print("\n✅ No lost updates")
+
+if __name__ == "__main__":
+    main()
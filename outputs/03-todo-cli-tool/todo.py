@@ -1,69 +1,733 @@
 #!/usr/bin/env python3
+import io
 import json
 import os
+import re
 import sys
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext, redirect_stdout
 from datetime import datetime
-from typing import List, Dict
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 
-class TodoManager:
-    def __init__(self, filename: str = "todos.json"):
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+BACKENDS = ("json", "log", "sqlite")
+DEFAULT_FILES = {"json": "todos.json", "log": "todos.log", "sqlite": "todos.db"}
+DEFAULT_SOCKET = "todos.sock"
+
+# Commands a running `todo.py serve` answers; todo_client.py runs the rest itself
+SERVED_COMMANDS = ("add", "list", "complete", "delete")
+
+# Seconds a client gets to send its whole request before the daemon moves on
+REQUEST_TIMEOUT = 5.0
+
+# Compact the log once dead records outnumber live tasks, and at least this many
+COMPACT_MIN_GARBAGE = 1000
+
+# Bytes read at a time when streaming todos.json
+STREAM_CHUNK = 64 * 1024
+SEPARATORS = re.compile(r'[\s,]*')
+
+# A change is ("add", task), ("update", task_id, fields) or ("delete", task_id)
+Change = Tuple
+
+class StorageError(Exception):
+    """The task file can't be read safely, so nothing is written over it."""
+
+class FileLock:
+    """Exclusive advisory lock on a lock file, shared by every todo.py process.
+
+    Re-entrant within a process, and also serializes threads (such as the
+    log compactor). Without fcntl only the threads of one process are locked.
+    """
+
+    def __init__(self, filename: str):
         self.filename = filename
-        self.todos = self.load_todos()
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.fd: Optional[int] = None
 
-    def load_todos(self) -> List[Dict]:
-        if os.path.exists(self.filename):
+    def __enter__(self):
+        self.thread_lock.acquire()
+        if self.depth == 0:
             try:
-                with open(self.filename, 'r') as f:
-                    return json.load(f)
+                self.fd = os.open(self.filename, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl:
+                    fcntl.flock(self.fd, fcntl.LOCK_EX)
+            except BaseException:
+                if self.fd is not None:
+                    os.close(self.fd)
+                    self.fd = None
+                self.thread_lock.release()
+                raise
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.depth -= 1
+        if self.depth == 0:
+            # Closing the descriptor releases the flock
+            os.close(self.fd)
+            self.fd = None
+        self.thread_lock.release()
+
+def fsync_directory(filename: str):
+    """Make a rename durable by syncing the directory that holds the file."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(filename)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Not supported for directories on every platform
+        pass
+    finally:
+        os.close(fd)
+
+def write_atomic(filename: str, lines: Iterable[str]):
+    """Write a file via a synced temp file and os.replace: readers see the old or new file, never half of one."""
+    temp_filename = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(temp_filename, 'w') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+    fsync_directory(filename)
+
+class MutationQueue:
+    """Changes waiting for whichever process holds the storage lock next.
+
+    Every writer appends its changes here, then takes the storage lock;
+    the holder reads the whole queue, writes it once, and only then removes
+    what it read. A writer that finds the queue empty had its changes
+    written by someone else; if the holder fails, the changes stay queued.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.lock = FileLock(f"{filename}.lock")
+
+    def push(self, changes: List[Change]):
+        line = json.dumps([list(change) for change in changes], separators=(',', ':')) + "\n"
+        with self.lock:
+            with open(self.filename, 'a') as f:
+                f.write(line)
+
+    def peek(self) -> Tuple[List[Change], int]:
+        """Return the queued changes and the number of bytes they take up."""
+        with self.lock:
+            if not os.path.exists(self.filename):
+                return [], 0
+            with open(self.filename, 'rb') as f:
+                data = f.read()
+        changes = []
+        for line in data.splitlines():
+            try:
+                changes.extend(tuple(change) for change in json.loads(line))
             except json.JSONDecodeError:
-                return []
-        return []
+                # A torn line from a writer that was killed mid-append
+                continue
+        return changes, len(data)
 
-    def save_todos(self):
-        with open(self.filename, 'w') as f:
-            json.dump(self.todos, f, indent=2)
+    def consume(self, size: int):
+        """Remove the first size bytes, keeping changes queued since they were read."""
+        with self.lock:
+            with open(self.filename, 'r+b') as f:
+                f.seek(size)
+                rest = f.read()
+                f.seek(0)
+                f.write(rest)
+                f.truncate()
 
-    def add_task(self, description: str):
+def iter_json_array(filename: str) -> Iterator[Dict]:
+    """Yield the items of a JSON array file one by one, reading it in chunks."""
+    decoder = json.JSONDecoder()
+    with open(filename, 'r') as f:
+        buffer = f.read(STREAM_CHUNK)
+        position = SEPARATORS.match(buffer).end()
+        if not buffer[position:position + 1] == "[":
+            raise json.JSONDecodeError("Expecting '['", buffer, position)
+        position += 1
+        while True:
+            position = SEPARATORS.match(buffer, position).end()
+            if buffer.startswith("]", position):
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The next item continues in the following chunk
+                chunk = f.read(STREAM_CHUNK)
+                if not chunk:
+                    raise
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            yield item
+
+class DuplicateId(Exception):
+    """Raised by unique_ids when a task repeats an earlier task's id."""
+
+def unique_ids(tasks: Iterable[Dict]) -> Iterator[Dict]:
+    """Pass tasks through, raising DuplicateId on one that renumber_duplicates would change."""
+    seen = set()
+    for task in tasks:
+        if task["id"] in seen:
+            raise DuplicateId(task["id"])
+        seen.add(task["id"])
+        yield task
+
+def renumber_duplicates(tasks: List[Dict], filename: str) -> List[Dict]:
+    """Give fresh ids to tasks that share an id with an earlier task.
+
+    Older versions numbered new tasks len(todos) + 1, which repeats an id
+    after a deletion. The first task keeps the id, so the result is the
+    same every time the file is read.
+    """
+    seen = set()
+    next_id = max((task["id"] for task in tasks), default=0) + 1
+    for task in tasks:
+        if task["id"] in seen:
+            print(f"⚠️ Task \"{task['description']}\" in {filename} shared id {task['id']} "
+                  f"with another task; it now has id {next_id}")
+            task["id"] = next_id
+            next_id += 1
+        seen.add(task["id"])
+    return tasks
+
+def matches(task: Dict, completed: Optional[bool], since: Optional[str]) -> bool:
+    if completed is not None and task["completed"] != completed:
+        return False
+    return since is None or task["created_at"] >= since
+
+def page_of(tasks: Iterable[Dict], completed: Optional[bool], since: Optional[str],
+            limit: Optional[int], offset: int) -> List[Dict]:
+    selected = (task for task in tasks if matches(task, completed, since))
+    return list(islice(selected, offset, None if limit is None else offset + limit))
+
+class MemoryStorage:
+    """Base for backends that keep every task in memory, indexed by id.
+
+    The file is only read on first use, so commands that don't need the
+    whole list can avoid loading it. Changes are applied under an exclusive
+    lock on <file>.lock, after picking up what other processes wrote, so
+    concurrent todo.py calls don't lose each other's updates. With batch
+    set, changes go through a MutationQueue and are written in groups.
+    """
+
+    def __init__(self, filename: str, batch: bool = False):
+        self.filename = filename
+        self.todos: Dict[int, Dict] = {}
+        self.next_id = 1
+        self.loaded = False
+        self.file_lock = FileLock(f"{filename}.lock")
+        self.queue = MutationQueue(f"{filename}.queue") if batch else None
+
+    def ensure_loaded(self):
+        if not self.loaded:
+            self.load()
+            self.loaded = True
+
+    def refresh(self):
+        """Bring the in-memory tasks up to date with the file; called under the lock."""
+        self.load()
+
+    def index(self, tasks: List[Dict]):
+        self.todos = {task["id"]: task for task in tasks}
+        self.next_id = max(self.todos, default=0) + 1
+
+    def tasks(self) -> List[Dict]:
+        self.ensure_loaded()
+        return list(self.todos.values())
+
+    def get(self, task_id: int) -> Optional[Dict]:
+        self.ensure_loaded()
+        return self.todos.get(task_id)
+
+    def page(self, completed: Optional[bool] = None, since: Optional[str] = None,
+             limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Tasks matching the filters, skipping offset and returning at most limit."""
+        self.ensure_loaded()
+        return page_of(self.todos.values(), completed, since, limit, offset)
+
+    def apply(self, changes: List[Change]):
+        """Apply changes on top of the latest file contents and persist them with a single write."""
+        if not changes:
+            return
+        if self.queue:
+            self.queue.push(changes)
+        with self.file_lock:
+            self.refresh()
+            if self.queue:
+                changes, queued_bytes = self.queue.peek()
+                if not changes:
+                    if queued_bytes:
+                        self.queue.consume(queued_bytes)
+                    return
+            records = []
+            for change in changes:
+                if change[0] == "add":
+                    task = change[1]
+                    task["id"] = self.next_id
+                    self.next_id += 1
+                    self.todos[task["id"]] = task
+                    records.append({"op": "add", "task": task})
+                elif change[0] == "update":
+                    _, task_id, fields = change
+                    # Another process may have deleted the task in the meantime
+                    if task_id in self.todos:
+                        self.todos[task_id].update(fields)
+                        records.append({"op": "update", "id": task_id, "fields": fields})
+                elif change[0] == "delete":
+                    if self.todos.pop(change[1], None) is not None:
+                        records.append({"op": "delete", "id": change[1]})
+            if records:
+                self.persist(records)
+            if self.queue:
+                # Only now are the queued changes safely on disk
+                self.queue.consume(queued_bytes)
+
+    def persist(self, records: List[Dict]):
+        raise NotImplementedError
+
+class JsonStorage(MemoryStorage):
+    """Keeps all tasks in one JSON file that is rewritten on every change.
+
+    The file is replaced atomically, so an interrupted write leaves the
+    previous version in place. A file that still fails to parse raises
+    StorageError instead of being read as an empty list and overwritten.
+    """
+
+    def __init__(self, filename: str = "todos.json", batch: bool = False):
+        super().__init__(filename, batch)
+        self.signature: Optional[Tuple] = None
+
+    def stat_signature(self) -> Optional[Tuple]:
+        try:
+            st = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def read(self) -> List[Dict]:
+        if not os.path.exists(self.filename):
+            return []
+        try:
+            with open(self.filename, 'r') as f:
+                return renumber_duplicates(json.load(f), self.filename)
+        except json.JSONDecodeError as e:
+            raise StorageError(f"{self.filename} is damaged ({e}); restore it or move it aside")
+
+    def load(self):
+        signature = self.stat_signature()
+        self.index(self.read())
+        self.signature = signature
+        self.loaded = True
+
+    def refresh(self):
+        # Skip the parse when nobody has replaced the file since we read it
+        if not self.loaded or self.stat_signature() != self.signature:
+            self.load()
+
+    def page(self, completed: Optional[bool] = None, since: Optional[str] = None,
+             limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        # Without a loaded list, parse only as far into the file as the page reaches
+        if self.loaded or not os.path.exists(self.filename):
+            return super().page(completed, since, limit, offset)
+        try:
+            return page_of(unique_ids(iter_json_array(self.filename)), completed, since, limit, offset)
+        except DuplicateId:
+            # Renumbering needs the highest id in the file, so load all of it
+            return super().page(completed, since, limit, offset)
+        except json.JSONDecodeError as e:
+            raise StorageError(f"{self.filename} is damaged ({e}); restore it or move it aside")
+
+    def save(self):
+        with self.file_lock:
+            write_atomic(self.filename, [json.dumps(self.tasks(), indent=2)])
+            self.signature = self.stat_signature()
+
+    def persist(self, records: List[Dict]):
+        self.save()
+
+class LogStorage(MemoryStorage):
+    """Appends one JSON line per change and replays the log on load.
+
+    Records are {"op": "add", "task": {...}}, {"op": "update", "id": 1,
+    "fields": {...}} and {"op": "delete", "id": 1}. Before each append, the
+    records other processes added since the last replay are read. When dead
+    records pile up, the log is compacted to one "add" per live task in a
+    background thread. A missing log is created from an existing todos.json.
+    """
+
+    def __init__(self, filename: str = "todos.log", json_filename: str = "todos.json", batch: bool = False):
+        super().__init__(filename, batch)
+        self.json_filename = json_filename
+        self.records = 0
+        # Bytes of the log replayed so far, and the inode they came from
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self.compactor: Optional[threading.Thread] = None
+
+    def load(self):
+        self.loaded = True
+        if not os.path.exists(self.filename):
+            todos = JsonStorage(self.json_filename).read()
+            self.index(todos)
+            if todos:
+                self.save()
+                print(f"📦 Migrated {len(todos)} tasks from {self.json_filename}")
+            return
+        self.inode = None
+        self.replay()
+
+    def refresh(self):
+        if not self.loaded:
+            self.load()
+        elif os.path.exists(self.filename):
+            self.replay()
+
+    def replay(self):
+        """Apply the records appended since the last replay."""
+        with open(self.filename, 'rb') as f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != self.inode:
+                # First read, or another process compacted the log
+                self.todos, self.next_id, self.records, self.offset = {}, 1, 0, 0
+                self.inode = inode
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A torn last line from an interrupted append
+                    break
+                self.offset += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.records += 1
+                if record["op"] == "add":
+                    self.todos[record["task"]["id"]] = record["task"]
+                    # Ids of deleted tasks still in the log are not handed out again
+                    self.next_id = max(self.next_id, record["task"]["id"] + 1)
+                elif record["op"] == "update" and record["id"] in self.todos:
+                    self.todos[record["id"]].update(record["fields"])
+                elif record["op"] == "delete":
+                    self.todos.pop(record["id"], None)
+
+    def persist(self, records: List[Dict]):
+        lines = "".join(json.dumps(record, separators=(',', ':')) + "\n" for record in records)
+        with self.file_lock:
+            with open(self.filename, 'ab') as f:
+                if f.tell() > self.offset:
+                    # Drop a torn line so the new records start on a line of their own
+                    f.truncate(self.offset)
+                f.write(lines.encode())
+                f.flush()
+                os.fsync(f.fileno())
+                self.offset = f.tell()
+                self.inode = os.fstat(f.fileno()).st_ino
+            self.records += len(records)
+        if self.records - len(self.todos) > max(COMPACT_MIN_GARBAGE, len(self.todos)):
+            self.compact_in_background()
+
+    def save(self):
+        """Rewrite the log as one "add" record per task."""
+        self.compact()
+
+    def compact(self):
+        with self.file_lock:
+            self.refresh()
+            write_atomic(self.filename, (json.dumps({"op": "add", "task": task}, separators=(',', ':')) + "\n"
+                                         for task in self.todos.values()))
+            st = os.stat(self.filename)
+            self.inode, self.offset, self.records = st.st_ino, st.st_size, len(self.todos)
+
+    def compact_in_background(self):
+        if self.compactor and self.compactor.is_alive():
+            return
+        # Not a daemon thread: the CLI prints its result first, then waits for it before exiting
+        self.compactor = threading.Thread(target=self.compact, name="todo-compactor")
+        self.compactor.start()
+
+class SqliteStorage:
+    """Keeps tasks in an indexed SQLite table, queried instead of loaded.
+
+    WAL mode lets readers run while another todo.py call writes, and every
+    batch of changes is one transaction. AUTOINCREMENT ids are never reused,
+    even after deletions. A new database imports an existing todos.json.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            completed INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            completed_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed, id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at);
+    """
+    COLUMNS = ("id", "description", "completed", "created_at", "completed_at")
+
+    def __init__(self, filename: str = "todos.db", json_filename: str = "todos.json"):
+        self.filename = filename
+        self.json_filename = json_filename
+        self.conn: Optional[sqlite3.Connection] = None
+
+    def ensure_loaded(self):
+        if self.conn is None:
+            self.load()
+
+    def load(self):
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(self.filename, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Schema and migration commit together: a failed migration leaves no
+        # half-created database that later calls would take as migrated
+        todos = []
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            new = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks'").fetchone() is None
+            for statement in self.SCHEMA.split(";"):
+                if statement.strip():
+                    self.conn.execute(statement)
+            if new:
+                todos = JsonStorage(self.json_filename).read()
+                self.insert_existing(todos)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        if todos:
+            print(f"📦 Migrated {len(todos)} tasks from {self.json_filename}")
+
+    @staticmethod
+    def to_task(row: sqlite3.Row) -> Dict:
         task = {
-            "id": len(self.todos) + 1,
+            "id": row["id"],
+            "description": row["description"],
+            "completed": bool(row["completed"]),
+            "created_at": row["created_at"]
+        }
+        if row["completed_at"]:
+            task["completed_at"] = row["completed_at"]
+        return task
+
+    @staticmethod
+    def to_row(task: Dict) -> Tuple:
+        return (task["description"], int(task.get("completed", False)),
+                task["created_at"], task.get("completed_at"))
+
+    def tasks(self) -> List[Dict]:
+        return self.page()
+
+    def get(self, task_id: int) -> Optional[Dict]:
+        self.ensure_loaded()
+        row = self.conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self.to_task(row) if row else None
+
+    def page(self, completed: Optional[bool] = None, since: Optional[str] = None,
+             limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Tasks matching the filters, served from the indexes with LIMIT/OFFSET."""
+        self.ensure_loaded()
+        conditions, params = [], []
+        if completed is not None:
+            conditions.append("completed = ?")
+            params.append(int(completed))
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        params += [-1 if limit is None else limit, offset]
+        rows = self.conn.execute(f"SELECT * FROM tasks {where}ORDER BY id LIMIT ? OFFSET ?", params)
+        return [self.to_task(row) for row in rows]
+
+    def write(self, statements) -> List[int]:
+        """Run (sql, params) pairs in one write transaction and return their lastrowids."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rowids = [self.conn.execute(sql, params).lastrowid for sql, params in statements]
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return rowids
+
+    def insert_existing(self, todos: List[Dict]):
+        """Insert tasks keeping their ids, inside the caller's transaction."""
+        self.conn.executemany("INSERT INTO tasks (id, description, completed, created_at, completed_at) "
+                              "VALUES (?, ?, ?, ?, ?)", [(task["id"],) + self.to_row(task) for task in todos])
+
+    def apply(self, changes: List[Change]):
+        """Apply a batch of changes in a single transaction."""
+        def statements():
+            for change in changes:
+                if change[0] == "add":
+                    yield ("INSERT INTO tasks (description, completed, created_at, completed_at) "
+                           "VALUES (?, ?, ?, ?)", self.to_row(change[1]))
+                elif change[0] == "update":
+                    _, task_id, fields = change
+                    columns = [column for column in fields if column in self.COLUMNS and column != "id"]
+                    values = [int(fields[column]) if column == "completed" else fields[column]
+                              for column in columns]
+                    yield (f"UPDATE tasks SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?",
+                           values + [task_id])
+                elif change[0] == "delete":
+                    yield ("DELETE FROM tasks WHERE id = ?", (change[1],))
+
+        if not changes:
+            return
+        self.ensure_loaded()
+        for change, rowid in zip(changes, self.write(statements())):
+            if change[0] == "add":
+                change[1]["id"] = rowid
+
+    def refresh(self):
+        # Queries always see the latest committed changes
+        pass
+
+    def save(self):
+        # Every change is committed as it is applied
+        pass
+
+def make_storage(backend: str, filename: Optional[str] = None, batch: bool = False):
+    # Migrate from the todos.json next to the backend's own file
+    json_filename = os.path.join(os.path.dirname(filename or ""), DEFAULT_FILES["json"])
+    if backend == "sqlite":
+        # SQLite transactions already group each batch of changes
+        return SqliteStorage(filename or DEFAULT_FILES["sqlite"], json_filename)
+    if backend == "log":
+        return LogStorage(filename or DEFAULT_FILES["log"], json_filename, batch=batch)
+    return JsonStorage(filename or DEFAULT_FILES["json"], batch=batch)
+
+class TodoManager:
+    def __init__(self, filename: str = "todos.json", storage=None):
+        self.storage = storage or JsonStorage(filename)
+        self.filename = self.storage.filename
+
+    @property
+    def todos(self) -> List[Dict]:
+        return self.storage.tasks()
+
+    def load_todos(self) -> List[Dict]:
+        self.storage.load()
+        return self.todos
+
+    def save_todos(self):
+        self.storage.save()
+
+    @staticmethod
+    def new_task(description: str) -> Dict:
+        return {
             "description": description,
             "completed": False,
             "created_at": datetime.now().isoformat()
         }
-        self.todos.append(task)
-        self.save_todos()
+
+    def add_task(self, description: str):
+        self.storage.apply([("add", self.new_task(description))])
         print(f"✅ Added task: {description}")
 
-    def list_tasks(self):
-        if not self.todos:
+    def list_tasks(self, completed: Optional[bool] = None, since: Optional[str] = None,
+                   limit: Optional[int] = None, offset: int = 0):
+        # One extra task tells whether there is another page
+        todos = self.storage.page(completed, since, None if limit is None else limit + 1, offset)
+        more = limit is not None and len(todos) > limit
+        todos = todos[:limit]
+        if not todos:
             print("📝 No tasks found!")
             return
 
         print("\n📋 Your Tasks:")
         print("-" * 50)
-        for task in self.todos:
+        for task in todos:
             status = "✅" if task["completed"] else "⏳"
             print(f"{status} [{task['id']}] {task['description']}")
+        if more:
+            print(f"... more tasks: use --offset {offset + limit}")
         print()
 
     def complete_task(self, task_id: int):
-        for task in self.todos:
-            if task["id"] == task_id:
-                task["completed"] = True
-                task["completed_at"] = datetime.now().isoformat()
-                self.save_todos()
-                print(f"🎉 Completed task: {task['description']}")
-                return
-        print(f"❌ Task with ID {task_id} not found!")
+        self.complete_tasks([task_id])
+
+    def complete_tasks(self, task_ids: List[int]):
+        """Complete several tasks with a single write."""
+        changes = []
+        completed = []
+        for task_id in task_ids:
+            task = self.storage.get(task_id)
+            if not task:
+                print(f"❌ Task with ID {task_id} not found!")
+                continue
+            changes.append(("update", task_id, {"completed": True, "completed_at": datetime.now().isoformat()}))
+            completed.append(task)
+        self.storage.apply(changes)
+        for task in completed:
+            print(f"🎉 Completed task: {task['description']}")
 
     def delete_task(self, task_id: int):
-        for i, task in enumerate(self.todos):
-            if task["id"] == task_id:
-                deleted_task = self.todos.pop(i)
-                self.save_todos()
-                print(f"🗑️ Deleted task: {deleted_task['description']}")
+        self.delete_tasks([task_id])
+
+    def delete_tasks(self, task_ids: List[int]):
+        """Delete several tasks with a single write."""
+        changes = []
+        deleted = []
+        for task_id in task_ids:
+            task = self.storage.get(task_id)
+            if not task:
+                print(f"❌ Task with ID {task_id} not found!")
+                continue
+            changes.append(("delete", task_id))
+            deleted.append(task)
+        self.storage.apply(changes)
+        for task in deleted:
+            print(f"🗑️ Deleted task: {task['description']}")
+
+    def import_tasks(self, filename: str):
+        """Add tasks from an NDJSON file (one task object per line) or a JSON list."""
+        with open(filename, 'r') as f:
+            text = f.read()
+        if text.lstrip().startswith("["):
+            items = json.loads(text)
+        else:
+            items = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+        changes = []
+        for number, item in enumerate(items, 1):
+            if isinstance(item, str):
+                item = {"description": item}
+            if not isinstance(item, dict) or not item.get("description"):
+                print(f"❌ Item {number} in {filename} has no description!")
                 return
-        print(f"❌ Task with ID {task_id} not found!")
+            task = self.new_task(item["description"])
+            task["completed"] = bool(item.get("completed", False))
+            task["created_at"] = item.get("created_at", task["created_at"])
+            if item.get("completed_at"):
+                task["completed_at"] = item["completed_at"]
+            changes.append(("add", task))
+        self.storage.apply(changes)
+        print(f"📥 Imported {len(changes)} tasks from {filename}")
+
+    def export_tasks(self, filename: str):
+        todos = self.todos
+        with open(filename, 'w') as f:
+            json.dump(todos, f, indent=2)
+        print(f"📤 Exported {len(todos)} tasks to {filename}")
 
 def show_help():
     print("""
@@ -71,54 +735,253 @@ def show_help():
 
 Usage:
     python todo.py add "Task description"    - Add a new task
-    python todo.py list                      - List all tasks
-    python todo.py complete <id>             - Mark task as completed
-    python todo.py delete <id>               - Delete a task
+    python todo.py list [options]            - List tasks
+        --pending / --done                   - Only open or only completed tasks
+        --since DATE                         - Only tasks created on or after DATE (YYYY-MM-DD)
+        --limit N --offset M                 - Show N tasks, skipping the first M
+    python todo.py complete <id> [<id>...]   - Mark tasks as completed
+    python todo.py delete <id> [<id>...]     - Delete tasks
+    python todo.py import <file>             - Add tasks from an NDJSON or JSON file
+    python todo.py export [file]             - Save tasks as JSON (default: todos.json)
+    python todo.py serve                     - Keep tasks in memory for todo_client.py
     python todo.py help                      - Show this help message
 
+Options:
+    --backend json|log|sqlite                - Storage backend (default: json, or $TODO_BACKEND)
+    --batch                                  - Group writes with other todo.py calls (or $TODO_BATCH=1)
+
 Examples:
     python todo.py add "Buy groceries"
     python todo.py complete 1
+    python todo.py complete 1 5 9
     python todo.py delete 2
+    python todo.py list --pending --limit 20
+    python todo.py --backend sqlite import tasks.ndjson
     """)
 
+def parse_ids(values: List[str]) -> Optional[List[int]]:
+    try:
+        return [int(value) for value in values]
+    except ValueError:
+        print("❌ Task ID must be a number!")
+        return None
+
+def parse_list_options(values: List[str]) -> Optional[Dict]:
+    options: Dict = {"completed": None, "since": None, "limit": None, "offset": 0}
+    values = list(values)
+    while values:
+        option = values.pop(0)
+        if option in ("--pending", "--done"):
+            options["completed"] = option == "--done"
+            continue
+        if option not in ("--since", "--limit", "--offset"):
+            print(f"❌ Unknown list option: {option}")
+            return None
+        if not values:
+            print(f"❌ Please provide a value for {option}!")
+            return None
+        value = values.pop(0)
+        if option == "--since":
+            try:
+                options["since"] = datetime.fromisoformat(value).isoformat()
+            except ValueError:
+                print("❌ Date must look like YYYY-MM-DD!")
+                return None
+        else:
+            try:
+                options[option[2:]] = int(value)
+            except ValueError:
+                print(f"❌ {option} must be a number!")
+                return None
+            if options[option[2:]] < 0:
+                print(f"❌ {option} can't be negative!")
+                return None
+    return options
+
+def parse_global_options(args: List[str], backend: str, batch: bool) -> Optional[Tuple[str, bool, List[str]]]:
+    """Take --backend and --batch out of args and return (backend, batch, remaining args)."""
+    args = list(args)
+    if "--backend" in args:
+        index = args.index("--backend")
+        if index + 1 >= len(args):
+            print("❌ Please provide a backend!")
+            return None
+        backend = args[index + 1]
+        del args[index:index + 2]
+    if "--batch" in args:
+        args.remove("--batch")
+        batch = True
+    if backend not in BACKENDS:
+        print(f"❌ Unknown backend: {backend} (choose from {', '.join(BACKENDS)})")
+        return None
+    return backend, batch, args
+
+class TodoServer:
+    """Answers todo.py commands over a Unix socket from tasks kept in memory.
+
+    A request is the client's default backend followed by its command-line
+    arguments, separated by NUL bytes. The reply is the exit code (or
+    "fallback" for commands the client must run itself) on the first line,
+    then the command's output. Before each command, the storage picks up
+    changes other todo.py processes made to the files.
+    """
+
+    def __init__(self, todo_manager: TodoManager, backend: str, path: str = DEFAULT_SOCKET):
+        self.todo_manager = todo_manager
+        self.backend = backend
+        self.path = path
+
+    def handle(self, request: bytes) -> str:
+        fields = request.decode().split("\0")
+        output = io.StringIO()
+        code = 0
+        with redirect_stdout(output):
+            options = parse_global_options(fields[1:], fields[0], False)
+            if options is None:
+                code = 1
+            else:
+                backend, _, args = options
+                # The daemon owns the tasks, so it already writes once per command without --batch
+                if backend != self.backend or not args or args[0].lower() not in SERVED_COMMANDS:
+                    return "fallback\n"
+                storage = self.todo_manager.storage
+                # Hold the file lock across refresh and command so a log compaction
+                # can't swap the file between reading it and writing to it
+                lock = storage.file_lock if isinstance(storage, MemoryStorage) else nullcontext()
+                try:
+                    with lock:
+                        storage.refresh()
+                        run_command(self.todo_manager, args)
+                except StorageError as e:
+                    print(f"❌ {e}")
+                    code = 1
+        return f"{code}\n{output.getvalue()}"
+
+    @staticmethod
+    def read_request(conn) -> Optional[bytes]:
+        """Read a request up to the client's shutdown, or None if it takes longer than REQUEST_TIMEOUT."""
+        deadline = time.monotonic() + REQUEST_TIMEOUT
+        chunks = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            conn.settimeout(remaining)
+            try:
+                chunk = conn.recv(65536)
+            except OSError:
+                # Timed out, or the client went away
+                return None
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+    def serve_forever(self):
+        # Imported here so ordinary commands don't pay for them
+        import signal
+        import socket
+
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+                print(f"❌ A todo daemon is already listening on {self.path}")
+                return
+            except OSError:
+                # Left behind by a daemon that didn't shut down cleanly
+                os.remove(self.path)
+            finally:
+                probe.close()
+
+        self.todo_manager.storage.ensure_loaded()
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        listener.listen(64)
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        print(f"🚀 Serving {self.todo_manager.filename} on {self.path} (Ctrl+C to stop)")
+        try:
+            while True:
+                conn, _ = listener.accept()
+                with conn:
+                    # A stalled client must not hold up every other todo command
+                    request = self.read_request(conn)
+                    if request is None:
+                        continue
+                    try:
+                        conn.sendall(self.handle(request).encode())
+                    except OSError:
+                        # The client went away; the command has still been applied
+                        pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            listener.close()
+            os.remove(self.path)
+            print("👋 Daemon stopped")
+
 def main():
-    if len(sys.argv) < 2:
+    options = parse_global_options(sys.argv[1:], os.environ.get("TODO_BACKEND", "json"),
+                                   os.environ.get("TODO_BATCH") == "1")
+    if options is None:
+        return
+    backend, batch, args = options
+
+    if len(args) < 1:
         show_help()
         return
 
-    todo_manager = TodoManager()
-    command = sys.argv[1].lower()
+    todo_manager = TodoManager(storage=make_storage(backend, batch=batch))
+    if args[0].lower() == "serve":
+        TodoServer(todo_manager, backend, os.environ.get("TODO_SOCKET", DEFAULT_SOCKET)).serve_forever()
+        return
+    try:
+        run_command(todo_manager, args)
+    except StorageError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def run_command(todo_manager: TodoManager, args: List[str]):
+    command = args[0].lower()
 
     if command == "add":
-        if len(sys.argv) < 3:
+        if len(args) < 2:
             print("❌ Please provide a task description!")
             return
-        description = " ".join(sys.argv[2:])
+        description = " ".join(args[1:])
         todo_manager.add_task(description)
 
     elif command == "list":
-        todo_manager.list_tasks()
+        options = parse_list_options(args[1:])
+        if options is not None:
+            todo_manager.list_tasks(**options)
 
     elif command == "complete":
-        if len(sys.argv) < 3:
+        if len(args) < 2:
             print("❌ Please provide a task ID!")
             return
-        try:
-            task_id = int(sys.argv[2])
-            todo_manager.complete_task(task_id)
-        except ValueError:
-            print("❌ Task ID must be a number!")
+        task_ids = parse_ids(args[1:])
+        if task_ids is not None:
+            todo_manager.complete_tasks(task_ids)
 
     elif command == "delete":
-        if len(sys.argv) < 3:
+        if len(args) < 2:
             print("❌ Please provide a task ID!")
             return
+        task_ids = parse_ids(args[1:])
+        if task_ids is not None:
+            todo_manager.delete_tasks(task_ids)
+
+    elif command == "import":
+        if len(args) < 2:
+            print("❌ Please provide a file to import!")
+            return
         try:
-            task_id = int(sys.argv[2])
-            todo_manager.delete_task(task_id)
-        except ValueError:
-            print("❌ Task ID must be a number!")
+            todo_manager.import_tasks(args[1])
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"❌ Cannot import {args[1]}: {e}")
+
+    elif command == "export":
+        todo_manager.export_tasks(args[1] if len(args) > 1 else DEFAULT_FILES["json"])
 
     elif command == "help":
         show_help()
@@ -128,4 +991,4 @@ def main():
         show_help()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
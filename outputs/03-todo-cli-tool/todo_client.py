@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Thin client for `todo.py serve`, taking the same arguments as todo.py.
+
+It only imports what it needs to talk to the daemon, so a call costs little
+more than interpreter startup. When no daemon is listening, or for commands
+the daemon doesn't serve, it runs todo.py in-process instead.
+"""
+import os
+import sys
+
+try:
+    # The C module behind socket, without the enum machinery socket.py imports
+    import _socket as socket
+except ImportError:
+    import socket
+
+DEFAULT_SOCKET = "todos.sock"
+
+def request(path, args):
+    """Send one command to the daemon and return (status, output)."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+        client.sendall("\0".join([os.environ.get("TODO_BACKEND", "json")] + args).encode())
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        client.close()
+    status, _, output = b"".join(chunks).decode().partition("\n")
+    return status, output
+
+def run_locally():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import todo
+    todo.main()
+
+def main():
+    args = sys.argv[1:]
+    try:
+        status, output = request(os.environ.get("TODO_SOCKET", DEFAULT_SOCKET), args)
+    except (OSError, AttributeError):
+        # No daemon running, a stale socket file, or no Unix sockets on this platform
+        run_locally()
+        return
+    if status == "fallback":
+        run_locally()
+        return
+    if not status:
+        # The command may or may not have been applied, so don't run it again
+        print("❌ The todo daemon closed the connection without answering")
+        sys.exit(1)
+    sys.stdout.write(output)
+    sys.exit(int(status))
+
+if __name__ == "__main__":
+    main()
@@ -1,125 +1,1626 @@
 #!/usr/bin/env python3
 import os
+import re
+import sys
+import csv
+import errno
+import json
+import time
+import queue
+import select
+import struct
 import shutil
+import hashlib
+import fnmatch
 import argparse
+import threading
+import ctypes
+import ctypes.util
+from stat import S_ISREG
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_FILE_TYPES = {
+    'Images': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.ico'],
+    'Documents': ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.pages'],
+    'Spreadsheets': ['.xls', '.xlsx', '.csv', '.ods', '.numbers'],
+    'Presentations': ['.ppt', '.pptx', '.odp', '.key'],
+    'Videos': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v'],
+    'Audio': ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a'],
+    'Archives': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', '.tar.gz', '.tar.bz2', '.tar.xz', '.tgz'],
+    'Code': ['.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.php', '.rb', '.go', '.rs'],
+    'Executables': ['.exe', '.msi', '.deb', '.rpm', '.dmg', '.pkg', '.app'],
+    'Fonts': ['.ttf', '.otf', '.woff', '.woff2', '.eot']
+}
+
+SIZE_UNITS = {
+    '': 1, 'B': 1,
+    'K': 1024, 'KB': 1024,
+    'M': 1024 ** 2, 'MB': 1024 ** 2,
+    'G': 1024 ** 3, 'GB': 1024 ** 3,
+    'T': 1024 ** 4, 'TB': 1024 ** 4,
+}
+
+# (offset, magic bytes, category); more specific signatures come first
+MAGIC_SIGNATURES = [
+    (0, b'\x89PNG\r\n\x1a\n', 'Images'),
+    (0, b'\xff\xd8\xff', 'Images'),
+    (0, b'GIF87a', 'Images'),
+    (0, b'GIF89a', 'Images'),
+    (8, b'WEBP', 'Images'),
+    (0, b'%PDF-', 'Documents'),
+    (0, b'{\\rtf', 'Documents'),
+    (0, b'PK\x03\x04', 'Archives'),
+    (0, b'Rar!\x1a\x07', 'Archives'),
+    (0, b"7z\xbc\xaf'\x1c", 'Archives'),
+    (0, b'\x1f\x8b', 'Archives'),
+    (0, b'BZh', 'Archives'),
+    (0, b'\xfd7zXZ\x00', 'Archives'),
+    (257, b'ustar', 'Archives'),
+    (8, b'AVI ', 'Videos'),
+    (0, b'\x1aE\xdf\xa3', 'Videos'),
+    (0, b'FLV\x01', 'Videos'),
+    (4, b'ftypM4A', 'Audio'),
+    (4, b'ftyp', 'Videos'),
+    (8, b'WAVE', 'Audio'),
+    (0, b'ID3', 'Audio'),
+    (0, b'fLaC', 'Audio'),
+    (0, b'OggS', 'Audio'),
+    (0, b'\xff\xfb', 'Audio'),
+    (0, b'wOFF', 'Fonts'),
+    (0, b'wOF2', 'Fonts'),
+    (0, b'OTTO', 'Fonts'),
+    (0, b'\x00\x01\x00\x00\x00', 'Fonts'),
+    (0, b'MZ', 'Executables'),
+    (0, b'\x7fELF', 'Executables'),
+    (0, b'\xcf\xfa\xed\xfe', 'Executables'),
+    (0, b'\xfe\xed\xfa\xcf', 'Executables'),
+    (0, b'#!', 'Code'),
+]
+
+# Enough for every signature above, including the tar header at offset 257
+SNIFF_BYTES = 512
+
+# Bytes hashed from each end of a file before committing to a full hash
+PARTIAL_BLOCK = 64 * 1024
+HASH_CHUNK = 1024 * 1024
+
+DEDUP_MODES = ('report', 'skip', 'hardlink')
+
+WATCH_POLL_INTERVAL = 1.0
+# Seconds between cache saves while watching; it is also saved on exit
+WATCH_CACHE_INTERVAL = 60.0
+# Recent move latencies kept for the p50/max figures in watch stats
+LATENCY_WINDOW = 1000
+
+# ioctl that shares a file's blocks with another file on btrfs/XFS (Linux)
+FICLONE = 0x40049409
+COPY_CHUNK = 8 * 1024 * 1024
+# Errors meaning "this copy method doesn't work here", not "the copy failed"
+UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                      errno.ENOTTY, errno.EBADF, errno.ETXTBSY}
+# Numbered backreferences and conditionals; wrapping rules in one combined
+# regex renumbers their groups, so these would refer to the wrong group
+NUMBERED_REFERENCE = re.compile(r'\\[1-9]|\(\?\(\d')
+# Errors from os.link on filesystems without hard links (FAT, some network mounts)
+NO_HARDLINK_ERRNOS = {errno.EPERM, errno.ENOSYS, errno.EOPNOTSUPP, errno.EMLINK}
+
+REPORT_FORMATS = ('text', 'json', 'ndjson', 'csv')
+REPORT_FIELDS = ('status', 'source', 'category', 'destination', 'bytes', 'detail')
+
+JOURNAL_NAME = '.organizer-journal.jsonl'
+# Moves written (and fsync'd) to the journal together before they happen
+JOURNAL_GROUP = 1000
+
+CACHE_NAME = '.organizer-cache.json'
+CACHE_VERSION = 1
+CACHE_MAX_ENTRIES = 500000
+
+def parse_size(value):
+    """Turn 4096, '10MB' or '1.5 GB' into a number of bytes."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([A-Za-z]*)\s*', str(value))
+    if not match or match.group(2).upper() not in SIZE_UNITS:
+        raise ValueError(f"Invalid size: {value!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+def format_size(size):
+    """Human-readable size, e.g. 1.5 MB."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def load_config(config_file):
+    """Read a rules config from a JSON or TOML file."""
+    path = Path(config_file)
+    if path.suffix.lower() == '.toml':
+        if tomllib is None:
+            raise ValueError("TOML configs need Python 3.11+ (tomllib); use a .json config instead")
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class RuleEngine:
+    """Classify files with rules and an extension index that are compiled once.
+
+    Rules are checked in order and the first match wins; files no rule claims
+    fall back to a dict lookup of their (possibly multi-part) suffix. All
+    name-only rules share one combined regex, so they cost a single match per
+    file however many there are.
+    """
+
+    def __init__(self, file_types, rules=()):
+        self.extension_index = {}
+        for category, extensions in file_types.items():
+            for extension in extensions:
+                extension = extension.lower()
+                if not extension.startswith('.'):
+                    extension = '.' + extension
+                # The first category listing an extension keeps it
+                self.extension_index.setdefault(extension, category)
+        self.max_suffix_parts = max((ext.count('.') for ext in self.extension_index), default=1)
+
+        self.categories = set(file_types) | {'Others'}
+        self.rule_categories = []
+        self.stat_rules = []
+        name_rules = []
+        for index, rule in enumerate(rules):
+            category, pattern, matcher, checks = self.compile_rule(rule)
+            self.categories.add(category)
+            self.rule_categories.append(category)
+            if checks:
+                self.stat_rules.append((index, category, matcher, checks))
+            else:
+                name_rules.append((index, pattern, matcher))
+        self.first_name_rule = self.compile_name_rules(name_rules)
+
+    def compile_rule(self, rule):
+        """Return (category, regex text, name matcher, stat checks) for one rule.
+
+        Checks take the stat result and the current time, so age rules stay
+        right in a --watch process that runs for days.
+        """
+        category = rule.get('category')
+        if not category:
+            raise ValueError(f"Rule without a category: {rule!r}")
+
+        pattern = matcher = None
+        try:
+            if 'glob' in rule:
+                pattern = fnmatch.translate(rule['glob'])
+                matcher = re.compile(pattern).match
+            elif 'regex' in rule:
+                pattern = f"(?s:.*?)(?:{rule['regex']})"
+                matcher = re.compile(rule['regex']).search
+        except re.error as e:
+            raise ValueError(f"Invalid pattern in rule for {category}: {e}")
+
+        checks = []
+        if 'min_size' in rule:
+            min_size = parse_size(rule['min_size'])
+            checks.append(lambda st, now: st.st_size >= min_size)
+        if 'max_size' in rule:
+            max_size = parse_size(rule['max_size'])
+            checks.append(lambda st, now: st.st_size <= max_size)
+        if 'older_than_days' in rule:
+            older_age = float(rule['older_than_days']) * 86400
+            checks.append(lambda st, now: st.st_mtime < now - older_age)
+        if 'newer_than_days' in rule:
+            newer_age = float(rule['newer_than_days']) * 86400
+            checks.append(lambda st, now: st.st_mtime >= now - newer_age)
+
+        if matcher is None and not checks:
+            raise ValueError(f"Rule for {category} needs glob, regex, min_size, max_size, "
+                             f"older_than_days or newer_than_days")
+        return category, pattern, matcher, checks
+
+    def compile_name_rules(self, name_rules):
+        """Build a function returning the index of the first name rule that matches."""
+        if not name_rules:
+            return lambda name: None
+
+        def match_each(name):
+            for index, _, matcher in name_rules:
+                if matcher(name):
+                    return index
+            return None
+
+        if any(NUMBERED_REFERENCE.search(pattern) for _, pattern, _ in name_rules):
+            return match_each
+        combined = '|'.join(f"(?P<_rule{index}>{pattern})" for index, pattern, _ in name_rules)
+        try:
+            regex = re.compile(combined)
+        except re.error:
+            # Regexes with clashing group names or inline flags can't share one pattern
+            return match_each
+
+        def first_match(name):
+            match = regex.match(name)
+            # The wrapper group closes last, so lastgroup names the winning rule
+            return int(match.lastgroup[5:]) if match else None
+        return first_match
+
+    def extension_category(self, name):
+        """Look up the longest known suffix of name, e.g. .tar.gz before .gz."""
+        lower = name.lower()
+        category = None
+        end = len(lower)
+        for _ in range(self.max_suffix_parts):
+            end = lower.rfind('.', 0, end)
+            # A leading dot starts a hidden name, not a suffix
+            if end <= 0:
+                break
+            category = self.extension_index.get(lower[end:], category)
+        return category or 'Others'
+
+    def classify(self, name, stat):
+        """Return the category for a file name; stat() is only called for size/age rules."""
+        winner = self.first_name_rule(name)
+        stat_result = None
+        for index, category, matcher, checks in self.stat_rules:
+            if winner is not None and index > winner:
+                break
+            if matcher and not matcher(name):
+                continue
+            if stat_result is None:
+                stat_result = stat()
+                now = time.time()
+            if all(check(stat_result, now) for check in checks):
+                return category
+        if winner is not None:
+            return self.rule_categories[winner]
+        return self.extension_category(name)
+
+class FileCache:
+    """Per-file facts saved between runs, keyed by (device, inode, size, mtime).
+
+    A rename keeps the inode, so files stay cached after they are moved into
+    a category folder, while any change to their content invalidates them.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self.seen = set()
+        self.dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def key(stat_result):
+        return f"{stat_result.st_dev}:{stat_result.st_ino}:{stat_result.st_size}:{stat_result.st_mtime_ns}"
+
+    def get(self, stat_result, field):
+        key = self.key(stat_result)
+        self.seen.add(key)
+        return self.entries.get(key, {}).get(field)
+
+    def set(self, stat_result, field, value):
+        key = self.key(stat_result)
+        self.seen.add(key)
+        self.entries.setdefault(key, {})[field] = value
+        self.dirty = True
+
+    def save(self):
+        """Write the cache atomically, dropping the stalest files beyond CACHE_MAX_ENTRIES."""
+        if not self.dirty:
+            return
+        # Files seen in this run go last, so the oldest unseen entries are dropped first
+        unseen = [key for key in self.entries if key not in self.seen]
+        unseen = unseen[max(0, len(self.entries) - CACHE_MAX_ENTRIES):]
+        entries = {key: self.entries[key] for key in unseen}
+        entries.update((key, self.entries[key]) for key in self.entries if key in self.seen)
+        # Keep the pruned entries in memory too, in their new order, so a
+        # long-running watch stays bounded and the next save starts afresh
+        self.entries = entries
+        self.seen.clear()
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'files': entries}, f)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Could not save cache {self.path}: {e}", file=sys.stderr)
+
+class ContentSniffer:
+    """Classify files by their leading magic bytes, reading each file once."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.categories = {category for _, _, category in MAGIC_SIGNATURES}
+        self.reads = 0
+        self.hits = 0
+
+    def sniff(self, file_path):
+        """Read the first few bytes of a file and match them against MAGIC_SIGNATURES."""
+        with open(file_path, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+        self.reads += 1
+        for offset, magic, category in MAGIC_SIGNATURES:
+            if head.startswith(magic, offset):
+                return category
+        return 'Others'
+
+    def category(self, file_path, stat_result):
+        category = self.cache.get(stat_result, 'type')
+        if category is not None:
+            self.hits += 1
+            return category
+        try:
+            category = self.sniff(file_path)
+        except OSError:
+            return 'Others'
+        self.cache.set(stat_result, 'type', category)
+        return category
+
+class DuplicateFinder:
+    """Find identical files by size, then a partial hash, then a full hash.
+
+    Each stage only looks at files still colliding after the previous one,
+    so most files are never read, and hashes are kept in the FileCache.
+    """
+
+    def __init__(self, cache, workers=1):
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.bytes_hashed = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def partial_hash(path, size):
+        """Hash the first and last PARTIAL_BLOCK bytes; small files are hashed whole."""
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as f:
+            if size <= 2 * PARTIAL_BLOCK:
+                digest.update(f.read())
+                return digest.hexdigest(), size
+            digest.update(f.read(PARTIAL_BLOCK))
+            f.seek(-PARTIAL_BLOCK, os.SEEK_END)
+            digest.update(f.read(PARTIAL_BLOCK))
+        return digest.hexdigest(), 2 * PARTIAL_BLOCK
+
+    @staticmethod
+    def full_hash(path, size):
+        """Hash a whole file in fixed-size chunks through one reused buffer."""
+        if size <= 2 * PARTIAL_BLOCK:
+            # The partial hash already covered the whole file
+            return DuplicateFinder.partial_hash(path, size)[0], 0
+        digest = hashlib.blake2b(digest_size=20)
+        buffer = bytearray(HASH_CHUNK)
+        view = memoryview(buffer)
+        total = 0
+        with open(path, 'rb', buffering=0) as f:
+            while True:
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                digest.update(view[:count])
+                total += count
+        return digest.hexdigest(), total
+
+    def hash_files(self, files, field, executor):
+        """Return {path: hash} for (path, stat_result) pairs, using the cache first."""
+        hashes = {}
+        pending = []
+        for path, stat_result in files:
+            cached = self.cache.get(stat_result, field)
+            if cached is not None:
+                self.cache_hits += 1
+                hashes[path] = cached
+            else:
+                pending.append((path, stat_result))
+
+        hasher = self.partial_hash if field == 'partial' else self.full_hash
+        futures = [(path, stat_result, executor.submit(hasher, path, stat_result.st_size))
+                   for path, stat_result in pending]
+        for path, stat_result, future in futures:
+            try:
+                digest, read = future.result()
+            except OSError as e:
+                print(f"   ❌ Cannot hash {path}: {e}", file=sys.stderr)
+                continue
+            self.bytes_hashed += read
+            hashes[path] = digest
+            self.cache.set(stat_result, field, digest)
+        return hashes
+
+    def find(self, candidates, existing=()):
+        """Map each duplicate candidate to the file it duplicates.
+
+        candidates and existing are (path, stat_result) pairs. Files already
+        organized are preferred as the copy to keep, then the oldest file.
+        Empty files are never reported as duplicates.
+        """
+        by_size = defaultdict(list)
+        for path, stat_result in existing:
+            by_size[stat_result.st_size].append((path, stat_result, True))
+        for path, stat_result in candidates:
+            by_size[stat_result.st_size].append((path, stat_result, False))
+
+        def colliding(groups):
+            return [group for group in groups
+                    if len(group) > 1 and not all(is_existing for _, _, is_existing in group)]
+
+        groups = colliding(group for size, group in by_size.items() if size)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for field in ('partial', 'full'):
+                files = [(path, stat_result) for group in groups for path, stat_result, _ in group]
+                hashes = self.hash_files(files, field, executor)
+                refined = []
+                for group in groups:
+                    by_hash = defaultdict(list)
+                    for item in group:
+                        if item[0] in hashes:
+                            by_hash[hashes[item[0]]].append(item)
+                    refined.extend(by_hash.values())
+                groups = colliding(refined)
+
+        duplicates = {}
+        for group in groups:
+            group.sort(key=lambda item: (not item[2], item[1].st_mtime, str(item[0])))
+            keeper = group[0][0]
+            for path, _, is_existing in group[1:]:
+                if not is_existing:
+                    duplicates[path] = keeper
+        return duplicates
+
+def read_lines_reversed(path, block_size=1024 * 1024):
+    """Yield the lines of a file from last to first, reading it in blocks from the end."""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b''
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + remainder).split(b'\n')
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line
+        if remainder:
+            yield remainder
+
+def rename_no_replace(source, destination):
+    """Rename source to destination, raising FileExistsError instead of replacing a file.
+
+    A hard link fails atomically when the name is taken, which a check
+    before os.rename can't guarantee against other processes.
+    """
+    try:
+        os.link(source, destination, follow_symlinks=False)
+    except OSError as e:
+        if e.errno not in NO_HARDLINK_ERRNOS:
+            raise
+        # No hard links here, so check then rename and accept the small window
+        if os.path.lexists(destination):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), str(destination))
+        os.rename(source, destination)
+        return
+    os.unlink(source)
+
+class MoveEngine:
+    """Move files with the cheapest strategy the filesystems allow.
+
+    Same-device moves are a rename. Otherwise the data is copied into a
+    hidden temporary file next to the destination, trying reflink,
+    copy_file_range, sendfile and plain read/write in that order; the copy
+    is size-checked and fsync'd before it takes the destination name and the
+    source is removed. Neither ever replaces an existing destination; they
+    raise FileExistsError instead. Bytes and time are counted per strategy.
+    """
 
-class FileOrganizer:
     def __init__(self):
-        self.file_types = {
-            'Images': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.ico'],
-            'Documents': ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.pages'],
-            'Spreadsheets': ['.xls', '.xlsx', '.csv', '.ods', '.numbers'],
-            'Presentations': ['.ppt', '.pptx', '.odp', '.key'],
-            'Videos': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v'],
-            'Audio': ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a'],
-            'Archives': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz'],
-            'Code': ['.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.php', '.rb', '.go', '.rs'],
-            'Executables': ['.exe', '.msi', '.deb', '.rpm', '.dmg', '.pkg', '.app'],
-            'Fonts': ['.ttf', '.otf', '.woff', '.woff2', '.eot']
+        self.lock = threading.Lock()
+        self.devices = {}
+        # (source folder, destination folder) pairs where rename gave EXDEV,
+        # e.g. two bind mounts of the same filesystem
+        self.cross_device = set()
+        copiers = [('reflink', self.copy_reflink), ('copy_file_range', self.copy_file_range),
+                   ('sendfile', self.copy_sendfile), ('read/write', self.copy_read_write)]
+        self.copiers = [(name, copier) for name, copier in copiers
+                        if name != 'reflink' or fcntl is not None]
+        self.unsupported = set()
+        self.stats = defaultdict(lambda: {'files': 0, 'bytes': 0, 'seconds': 0.0})
+
+    def device(self, folder):
+        """st_dev of a folder, looked up once per folder."""
+        device = self.devices.get(folder)
+        if device is None:
+            device = self.devices[folder] = os.stat(folder).st_dev
+        return device
+
+    def record(self, strategy, size, seconds):
+        with self.lock:
+            totals = self.stats[strategy]
+            totals['files'] += 1
+            totals['bytes'] += size
+            totals['seconds'] += seconds
+
+    def move(self, source, destination):
+        """Move source to destination and return the strategy used."""
+        source, destination = Path(source), Path(destination)
+        start = time.perf_counter()
+        folders = (source.parent, destination.parent)
+        if folders not in self.cross_device and self.device(source.parent) == self.device(destination.parent):
+            try:
+                size = source.stat().st_size
+                rename_no_replace(source, destination)
+                self.record('rename', size, time.perf_counter() - start)
+                return 'rename'
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                with self.lock:
+                    self.cross_device.add(folders)
+
+        strategy, size = self.copy(source, destination)
+        self.record(strategy, size, time.perf_counter() - start)
+        return strategy
+
+    def copy(self, source, destination):
+        """Copy source to destination through a temporary file, then remove source."""
+        temp_path = destination.with_name(f".{destination.name}.part")
+        src_fd = os.open(source, os.O_RDONLY)
+        try:
+            size = os.fstat(src_fd).st_size
+            dst_fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                strategy = self.copy_data(src_fd, dst_fd, size)
+                copied = os.fstat(dst_fd).st_size
+                if copied != size:
+                    raise OSError(errno.EIO, f"copied {copied} of {size} bytes")
+                os.fsync(dst_fd)
+            finally:
+                os.close(dst_fd)
+            shutil.copystat(source, temp_path)
+            rename_no_replace(temp_path, destination)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        finally:
+            os.close(src_fd)
+        os.unlink(source)
+        return strategy, size
+
+    def copy_data(self, src_fd, dst_fd, size):
+        """Try each copier until one is supported for this pair of files."""
+        for name, copier in self.copiers:
+            if name in self.unsupported:
+                continue
+            try:
+                copier(src_fd, dst_fd, size)
+                return name
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                if e.errno == errno.ENOSYS:
+                    # Missing from this kernel; other errors depend on the filesystems
+                    self.unsupported.add(name)
+                # Start over for the next strategy
+                os.ftruncate(dst_fd, 0)
+                os.lseek(src_fd, 0, os.SEEK_SET)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+        raise OSError(errno.EIO, "no copy strategy worked")
+
+    @staticmethod
+    def copy_reflink(src_fd, dst_fd, size):
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+
+    @staticmethod
+    def copy_file_range(src_fd, dst_fd, size):
+        if not hasattr(os, 'copy_file_range'):
+            raise OSError(errno.ENOSYS, "copy_file_range is not available")
+        remaining = size
+        while remaining > 0:
+            copied = os.copy_file_range(src_fd, dst_fd, min(remaining, COPY_CHUNK))
+            if not copied:
+                break
+            remaining -= copied
+
+    @staticmethod
+    def copy_sendfile(src_fd, dst_fd, size):
+        if not hasattr(os, 'sendfile'):
+            raise OSError(errno.ENOSYS, "sendfile is not available")
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(dst_fd, src_fd, offset, min(size - offset, COPY_CHUNK))
+            if not sent:
+                break
+            offset += sent
+
+    @staticmethod
+    def copy_read_write(src_fd, dst_fd, size):
+        while True:
+            chunk = os.read(src_fd, COPY_CHUNK)
+            if not chunk:
+                break
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(dst_fd, view):]
+
+class MoveJournal:
+    """Append-only NDJSON record of planned moves, used to resume and undo runs.
+
+    Each group of up to JOURNAL_GROUP moves is written and fsync'd before any
+    of them happens, and marked done afterwards. Paths are relative to the
+    organized directory. Records look like:
+
+        {"op": "run", "run": "...", "source": "...", "started": "..."}
+        {"op": "plan", "run": "...", "group": 1, "moves": [["a.jpg", "Images/a.jpg"], ...]}
+        {"op": "done", "run": "...", "group": 1}
+        {"op": "end", "run": "..."}
+        {"op": "undone", "run": "..."}
+    """
+
+    def __init__(self, path, source_path):
+        self.path = Path(path)
+        self.source_path = source_path
+        self.file = None
+        self.run = None
+        self.group = 0
+
+    def open(self):
+        """Open the journal for appending, ending a line torn by a crash first."""
+        if self.file is None:
+            self.file = open(self.path, 'a+b')
+            if self.file.seek(0, os.SEEK_END) > 0:
+                self.file.seek(-1, os.SEEK_END)
+                if self.file.read(1) != b'\n':
+                    self.file.write(b'\n')
+
+    def append(self, record, sync=False):
+        self.file.write(json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n')
+        self.file.flush()
+        if sync:
+            os.fsync(self.file.fileno())
+
+    def start(self):
+        self.run = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        self.group = 0
+        self.open()
+        self.append({'op': 'run', 'run': self.run, 'source': str(self.source_path.resolve()),
+                     'started': time.strftime('%Y-%m-%dT%H:%M:%S')}, sync=True)
+
+    def plan(self, moves):
+        """Record a group of (source, destination) paths before moving them."""
+        self.group += 1
+        pairs = [[str(src.relative_to(self.source_path)), str(dst.relative_to(self.source_path))]
+                 for src, dst in moves]
+        self.append({'op': 'plan', 'run': self.run, 'group': self.group, 'moves': pairs}, sync=True)
+
+    def replan(self, source, destination):
+        """Record a new destination for one move of the current group, before moving it.
+
+        Undo and resume read records newest first, so this entry wins over
+        the one in the group's plan.
+        """
+        self.append({'op': 'plan', 'run': self.run, 'group': self.group,
+                     'moves': [[str(source.relative_to(self.source_path)),
+                                str(destination.relative_to(self.source_path))]]}, sync=True)
+
+    def done(self):
+        # No fsync: a lost marker only means the group is re-checked on resume
+        self.append({'op': 'done', 'run': self.run, 'group': self.group})
+
+    def finish(self, run=None):
+        self.open()
+        self.append({'op': 'end', 'run': run or self.run}, sync=True)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def records(self):
+        """Yield journal records from newest to oldest."""
+        if not self.path.exists():
+            return
+        for line in read_lines_reversed(self.path):
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # A torn last line from a crash mid-write
+                continue
+
+    def run_records(self, skip_undone=False):
+        """Yield the records of the latest run, newest first.
+
+        Runs that were undone are skipped with skip_undone, otherwise an
+        undone latest run yields nothing.
+        """
+        undone = set()
+        run = None
+        for record in self.records():
+            if record['op'] == 'undone':
+                undone.add(record['run'])
+                continue
+            if run is None:
+                if record['run'] in undone:
+                    if skip_undone:
+                        continue
+                    return
+                run = record['run']
+            if record['run'] == run:
+                yield record
+                if record['op'] == 'run':
+                    return
+
+    def unfinished_run(self):
+        """Return (run id, done group count, plans not marked done) if the latest run was interrupted."""
+        run = None
+        done_groups = set()
+        pending = []
+        for record in self.run_records():
+            run = record['run']
+            if record['op'] == 'end':
+                return None
+            if record['op'] == 'done':
+                done_groups.add(record['group'])
+            elif record['op'] == 'plan' and record['group'] not in done_groups:
+                pending.append(record)
+        if run is None:
+            return None
+        return run, len(done_groups), pending
+
+    def mark_undone(self, run):
+        self.open()
+        self.append({'op': 'undone', 'run': run}, sync=True)
+        self.close()
+
+class InotifyWatcher:
+    """Report files created or written in a directory using Linux inotify."""
+
+    EVENTS = 0x008 | 0x080 | 0x100  # CLOSE_WRITE, MOVED_TO, CREATE
+    OVERFLOW = 0x4000
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, path):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), self.EVENTS) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"cannot watch {path}")
+
+    def changes(self, timeout):
+        """Wait up to timeout seconds and return changed names, or None if events were lost."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        buffer = os.read(self.fd, 64 * 1024)
+        names = set()
+        offset = 0
+        while offset < len(buffer):
+            _, mask, _, length = self.EVENT_HEADER.unpack_from(buffer, offset)
+            offset += self.EVENT_HEADER.size
+            if mask & self.OVERFLOW:
+                return None
+            name = buffer[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+            if name:
+                names.add(name)
+        return names
+
+class PollingWatcher:
+    """Fallback watcher that compares directory snapshots."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat_result = entry.stat()
+                    snapshot[entry.name] = (stat_result.st_mtime_ns, stat_result.st_size)
+        return snapshot
+
+    def changes(self, timeout):
+        """Wait up to timeout seconds and return the names of new or changed files."""
+        time.sleep(min(timeout, WATCH_POLL_INTERVAL))
+        current = self.scan()
+        names = {name for name, signature in current.items() if self.snapshot.get(name) != signature}
+        self.snapshot = current
+        return names
+
+def make_watcher(path):
+    """Use inotify where the platform has it, otherwise poll."""
+    try:
+        return InotifyWatcher(path)
+    except (OSError, AttributeError):
+        return PollingWatcher(path)
+
+class WatchStats:
+    """Throughput and latency counters for watch mode."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.moved = 0
+        self.failed = 0
+        self.bytes = 0
+        self.batches = 0
+        self.queued = 0
+        self.pending = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.last_report = time.monotonic()
+        self.last_moved = 0
+
+    def record(self, moved, size, latency):
+        if moved:
+            self.moved += 1
+            self.bytes += size
+            self.latencies.append(latency)
+        else:
+            self.failed += 1
+
+    def snapshot(self):
+        latencies = sorted(self.latencies)
+        uptime = time.time() - self.started
+        return {
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'uptime': round(uptime, 1),
+            'moved': self.moved,
+            'failed': self.failed,
+            'bytes': self.bytes,
+            'batches': self.batches,
+            'queued': self.queued,
+            'pending': self.pending,
+            'files_per_sec': round(self.moved / uptime, 2) if uptime else 0.0,
+            'latency_p50': round(latencies[len(latencies) // 2], 3) if latencies else None,
+            'latency_max': round(latencies[-1], 3) if latencies else None,
         }
+
+    def line(self):
+        """A one-line summary, with the rate measured since the previous line."""
+        now = time.monotonic()
+        rate = (self.moved - self.last_moved) / max(now - self.last_report, 1e-9)
+        self.last_report, self.last_moved = now, self.moved
+        data = self.snapshot()
+        latency = (f"{data['latency_p50']:.2f}s p50 / {data['latency_max']:.2f}s max"
+                   if data['latency_p50'] is not None else "n/a")
+        return (f"📈 {data['moved']} moved ({rate:.1f}/s), {data['failed']} failed, "
+                f"{data['bytes'] / 1048576:.1f} MB, queue {data['queued']}, "
+                f"waiting {data['pending']}, latency {latency}")
+
+    def write(self, status_file):
+        temp_path = f"{status_file}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(temp_path, status_file)
+
+class Reporter:
+    """Where organize runs send progress, per-file events and the summary.
+
+    Per-file events have a status such as would_move, moved or failed, and
+    are written as soon as they happen. With quiet, only errors and the
+    summary are written.
+    """
+
+    # Machine formats stream events as files are scanned instead of grouping them
+    streams = True
+
+    def __init__(self, stream=None, quiet=False):
+        self.stream = stream or sys.stdout
+        self.quiet = quiet
+        self.lock = threading.Lock()
+
+    def info(self, text):
+        """Progress lines for people; kept off stdout for machine formats."""
+        if not self.quiet:
+            print(text, file=sys.stderr)
+
+    def error(self, text):
+        print(text, file=sys.stderr)
+
+    def category(self, category, count):
+        pass
+
+    def file(self, status, source, category, destination='', size=0, detail=''):
+        if self.quiet and status != 'failed':
+            return
+        record = {'status': status, 'source': str(source), 'category': category,
+                  'destination': str(destination), 'bytes': size, 'detail': str(detail)}
+        with self.lock:
+            self.write_record(record)
+
+    def write_record(self, record):
+        raise NotImplementedError
+
+    def summary(self, data):
+        raise NotImplementedError
+
+    def close(self):
+        self.stream.flush()
+
+class TextReporter(Reporter):
+    """The emoji-decorated console output."""
+
+    streams = False
+
+    LINES = {
+        'would_move': "   Would move: {source} → {category}/",
+        'moved': "   ✅ Moved: {source} → {category}/",
+        'failed': "   ❌ Error moving {source}: {detail}",
+        'skipped_duplicate': "   ⏭️ Skipped duplicate: {source} = {detail}",
+        'duplicate': "   🔁 Duplicate: {source} = {detail}",
+        'would_hardlink': "   Would hardlink: {source} = {detail}",
+        'hardlinked': "   🔗 Hardlinked: {source} = {detail}",
+        'would_restore': "   Would restore: {source} → {destination}",
+        'restored': "   ↩️ Restored: {source} → {destination}",
+    }
+
+    def __init__(self, stream=None, quiet=False):
+        super().__init__(stream, quiet)
+        # Quiet text runs have no per-category listing, so they can stream too
+        self.streams = quiet
+
+    def info(self, text):
+        if not self.quiet:
+            print(text, file=self.stream)
+
+    def error(self, text):
+        print(text, file=self.stream)
+
+    def category(self, category, count):
+        if not self.quiet:
+            print(f"\n📂 {category} ({count} files):", file=self.stream)
+
+    def write_record(self, record):
+        line = self.LINES.get(record['status'])
+        if line:
+            print(line.format(**record), file=self.stream)
+
+    def summary(self, data):
+        out = self.stream
+        print("\n" + "=" * 60, file=out)
+        print(f"📊 {'PREVIEW' if data['dry_run'] else 'ORGANIZATION'} SUMMARY", file=out)
+        print("=" * 60, file=out)
+
+        if data['files']:
+            label = "Files to organize" if data['dry_run'] else "Total files organized"
+            print(f"{label}: {data['files']} ({format_size(data['bytes'])})", file=out)
+            print("\nFiles by category:", file=out)
+            for category, totals in data['categories'].items():
+                print(f"  {category}: {totals['files']} files ({format_size(totals['bytes'])})", file=out)
+        if data['dry_run']:
+            print("Run without --dry-run to actually organize the files.", file=out)
+        elif not data['files']:
+            print("No files were organized.", file=out)
+
+        if data['failed']:
+            print(f"Failed: {data['failed']}", file=out)
+        if data['duplicates']:
+            action = {'skip': 'skipped', 'hardlink': 'hardlinked'}[data['dedup']]
+            print(f"Duplicates {action}: {data['duplicates']}", file=out)
+
+        if data['strategies']:
+            print("\nMoves by strategy:", file=out)
+            for strategy, totals in data['strategies'].items():
+                megabytes = totals['bytes'] / 1048576
+                rate = megabytes / totals['seconds'] if totals['seconds'] else 0.0
+                print(f"  {strategy}: {totals['files']} files, {megabytes:.1f} MB, {rate:.1f} MB/s", file=out)
+
+class NdjsonReporter(Reporter):
+    """One JSON object per line: file events, then a final summary object."""
+
+    def write_record(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def summary(self, data):
+        self.stream.write(json.dumps({'summary': data}, ensure_ascii=False) + '\n')
+
+class JsonReporter(Reporter):
+    """A single JSON document whose files array is written incrementally."""
+
+    def __init__(self, stream=None, quiet=False):
+        super().__init__(stream, quiet)
+        self.count = 0
+        self.finished = False
+        self.stream.write('{"files": [')
+
+    def write_record(self, record):
+        self.stream.write((',\n' if self.count else '\n') + json.dumps(record, ensure_ascii=False))
+        self.count += 1
+
+    def summary(self, data):
+        self.stream.write('\n], "summary": ' + json.dumps(data, ensure_ascii=False) + '}\n')
+        self.finished = True
+
+    def close(self):
+        # Keep the document valid when a run ends without a summary
+        if not self.finished:
+            self.stream.write('\n], "summary": null}\n')
+            self.finished = True
+        super().close()
+
+class CsvReporter(Reporter):
+    """CSV rows of REPORT_FIELDS; the summary adds one 'total' row per category."""
+
+    def __init__(self, stream=None, quiet=False):
+        super().__init__(stream, quiet)
+        self.writer = csv.writer(self.stream)
+        self.writer.writerow(REPORT_FIELDS)
+
+    def write_record(self, record):
+        self.writer.writerow([record[field] for field in REPORT_FIELDS])
+
+    def summary(self, data):
+        for category, totals in data['categories'].items():
+            self.writer.writerow(['total', '', category, '', totals['bytes'], f"{totals['files']} files"])
+
+def make_reporter(output_format='text', quiet=False):
+    reporters = {'text': TextReporter, 'json': JsonReporter, 'ndjson': NdjsonReporter, 'csv': CsvReporter}
+    return reporters[output_format](quiet=quiet)
+
+class FileOrganizer:
+    def __init__(self, config_file=None, sniff=False, cache_file=None, dedup=None,
+                 journal=True, journal_file=None, report=None):
+        config = load_config(config_file) if config_file else {}
+        # Categories from the config take precedence over the built-in ones
+        self.file_types = dict(config.get('categories', {}))
+        if not config.get('replace_categories', False):
+            for category, extensions in DEFAULT_FILE_TYPES.items():
+                self.file_types.setdefault(category, extensions)
+        self.rules = RuleEngine(self.file_types, config.get('rules', []))
+        self.sniff = sniff
+        self.cache_file = cache_file
+        self.sniffer = None
+        self.dedup = dedup
+        self.duplicates = 0
+        self.journal = journal
+        self.journal_file = journal_file
+        self.mover = MoveEngine()
+        self.report = report or TextReporter()
+        self.bytes = defaultdict(int)
+        self.failed = 0
         self.stats = defaultdict(int)
+        self.lock = threading.Lock()
+        self.taken_names = {}
+        self.next_counter = {}
 
-    def get_file_category(self, file_path):
-        """Determine the category of a file based on its extension."""
-        extension = file_path.suffix.lower()
-        
-        for category, extensions in self.file_types.items():
-            if extension in extensions:
-                return category
-        
-        return 'Others'
+    def get_file_category(self, file_path, stat=None):
+        """Determine the category of a file from the rules, its extension or its content."""
+        stat = stat or file_path.stat
+        category = self.rules.classify(file_path.name, stat)
+        if category == 'Others' and self.sniffer:
+            category = self.sniffer.category(file_path, stat())
+        return category
 
     def create_folder_if_not_exists(self, folder_path):
         """Create a folder if it doesn't exist."""
         if not folder_path.exists():
             folder_path.mkdir(parents=True, exist_ok=True)
-            print(f"📁 Created folder: {folder_path}")
+            self.report.info(f"📁 Created folder: {folder_path}")
+
+    def scan_files(self, directory, recursive=False, skip_dirs=()):
+        """Yield visible files under directory using os.scandir.
+
+        DirEntry caches the file type from the directory listing, so files are
+        found without an extra stat() per entry on most filesystems.
+        """
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.name.startswith('.'):
+                            continue
+                        if entry.is_file():
+                            yield entry
+                        elif recursive and entry.is_dir(follow_symlinks=False):
+                            if current == directory and entry.name in skip_dirs:
+                                continue
+                            pending.append(entry.path)
+            except OSError as e:
+                self.report.error(f"   ❌ Cannot scan {current}: {e}")
+
+    def folder_names(self, category_folder):
+        """Case-folded names taken in a category folder, listed once per run (call with self.lock held).
+
+        Case-folding keeps photo.jpg and Photo.JPG apart on case-insensitive filesystems.
+        """
+        names = self.taken_names.get(category_folder)
+        if names is None:
+            try:
+                with os.scandir(category_folder) as entries:
+                    names = {entry.name.casefold() for entry in entries}
+            except FileNotFoundError:
+                names = set()
+            self.taken_names[category_folder] = names
+        return names
+
+    def reserve_destination(self, category_folder, name):
+        """Pick a free destination name, safe against other mover threads.
+
+        Conflicts are resolved against an in-memory name set, and the next
+        counter to try is remembered per name, so the thousandth IMG_0001.jpg
+        doesn't probe the 999 names before it. Files created by other
+        processes after the listing are caught by the move itself.
+        """
+        with self.lock:
+            names = self.folder_names(category_folder)
+            if name.casefold() not in names:
+                names.add(name.casefold())
+                return category_folder / name
+
+            # Handle file name conflicts
+            original = Path(name)
+            key = (category_folder, name.casefold())
+            counter = self.next_counter.get(key, 1)
+            while f"{original.stem}_{counter}{original.suffix}".casefold() in names:
+                counter += 1
+            self.next_counter[key] = counter + 1
+            name = f"{original.stem}_{counter}{original.suffix}"
+            names.add(name.casefold())
+            return category_folder / name
+
+    def move_file(self, file_path, category, category_folder, display_name, destination=None, size=0,
+                  journal=None):
+        """Move one file into its category folder; return whether it moved."""
+        try:
+            if destination is None:
+                destination = self.reserve_destination(category_folder, file_path.name)
+            while True:
+                try:
+                    self.mover.move(file_path, destination)
+                    break
+                except FileExistsError:
+                    # Another process took the name after the folder was listed
+                    destination = self.reserve_destination(category_folder, file_path.name)
+                    if journal:
+                        with self.lock:
+                            journal.replan(file_path, destination)
+            self.report.file('moved', display_name, category, f"{category}/{destination.name}", size)
+            with self.lock:
+                self.stats[category] += 1
+                self.bytes[category] += size
+            return True
+        except Exception as e:
+            self.report.file('failed', display_name, category, '', size, e)
+            with self.lock:
+                self.failed += 1
+            return False
+
+    def move_group(self, moves, category, category_folder, executor, workers, journal=None):
+        """Move a group of (path, display name, size) tuples, journaling their destinations first."""
+        planned = [(file_path, self.reserve_destination(category_folder, file_path.name), display_name, size)
+                   for file_path, display_name, size in moves]
+        if journal:
+            journal.plan([(file_path, destination) for file_path, destination, _, _ in planned])
+
+        if workers > 1:
+            futures = [executor.submit(self.move_file, file_path, category, category_folder,
+                                       display_name, destination, size, journal)
+                       for file_path, destination, display_name, size in planned]
+            for future in futures:
+                future.result()
+        else:
+            for file_path, destination, display_name, size in planned:
+                self.move_file(file_path, category, category_folder, display_name, destination, size, journal)
+
+        if journal:
+            journal.done()
+
+    def journal_path(self, source_path):
+        return Path(self.journal_file) if self.journal_file else source_path / JOURNAL_NAME
+
+    def resume_interrupted(self, source_path, journal):
+        """Finish the planned moves of a run that was interrupted."""
+        unfinished = journal.unfinished_run()
+        if not unfinished:
+            return
+        run, done, pending = unfinished
+        self.report.info(f"♻️ Resuming interrupted run {run}: {done} groups already done")
+
+        resumed = 0
+        for plan in reversed(pending):
+            for src, dst in plan['moves']:
+                src_path, dst_path = source_path / src, source_path / dst
+                if src_path.exists() and dst_path.exists() and os.path.samefile(src_path, dst_path):
+                    # Interrupted between linking the destination and removing the source
+                    src_path.unlink()
+                    resumed += 1
+                elif src_path.exists() and not dst_path.exists():
+                    try:
+                        dst_path.parent.mkdir(parents=True, exist_ok=True)
+                        self.mover.move(src_path, dst_path)
+                    except OSError as e:
+                        # Leave the file where it is; this run still picks it up
+                        self.report.file('failed', src, dst_path.parent.name, dst, 0, e)
+                        self.failed += 1
+                        continue
+                    self.stats[dst_path.parent.name] += 1
+                    resumed += 1
+        # Mark the run finished even after failures, so later runs don't retry it forever
+        journal.finish(run)
+        self.report.info(f"   ✅ Finished {resumed} planned moves")
+
+    def undo(self, source_dir, dry_run=False):
+        """Move the files of the latest journaled run back where they came from."""
+        source_path = Path(source_dir)
+        journal = MoveJournal(self.journal_path(source_path), source_path)
+        run = None
+        restored = skipped = 0
+        folders = set()
+        # Records stream newest first; each group's moves are undone in reverse as well
+        for record in journal.run_records(skip_undone=True):
+            if run is None:
+                run = record['run']
+                self.report.info(f"↩️ {'Previewing undo of' if dry_run else 'Undoing'} run {run}")
+            if record['op'] != 'plan':
+                continue
+            for src, dst in reversed(record['moves']):
+                src_path, dst_path = source_path / src, source_path / dst
+                if not dst_path.exists() or src_path.exists():
+                    skipped += 1
+                    continue
+                category = dst_path.parent.name
+                if dry_run:
+                    self.report.file('would_restore', dst, category, src, dst_path.stat().st_size)
+                    restored += 1
+                    continue
+                try:
+                    size = dst_path.stat().st_size
+                    src_path.parent.mkdir(parents=True, exist_ok=True)
+                    self.mover.move(dst_path, src_path)
+                except OSError as e:
+                    self.report.file('failed', dst, category, src, 0, e)
+                    continue
+                self.report.file('restored', dst, category, src, size)
+                folders.add(dst_path.parent)
+                restored += 1
 
-    def organize_directory(self, source_dir, dry_run=False):
+        if run is None:
+            self.report.info(f"📝 Nothing to undo in {journal.path}")
+            return
+
+        if not dry_run:
+            # Category folders the run created are removed again once empty
+            for folder in folders:
+                try:
+                    folder.rmdir()
+                except OSError:
+                    pass
+            journal.mark_undone(run)
+        self.report.info(f"{'Would restore' if dry_run else 'Restored'} {restored} files ({skipped} already moved or missing)")
+
+    def find_duplicates(self, source_path, categorized_files, file_stats, cache, workers):
+        """Find candidates that duplicate each other or a file already in its category folder."""
+        existing = []
+        for category in categorized_files:
+            category_folder = source_path / category
+            if category_folder.is_dir():
+                existing.extend((Path(entry.path), entry.stat())
+                                for entry in self.scan_files(str(category_folder)))
+
+        finder = DuplicateFinder(cache, workers)
+        duplicates = finder.find(file_stats.items(), existing)
+        wasted = sum(file_stats[path].st_size for path in duplicates)
+        self.report.info(f"🧬 Duplicates: {len(duplicates)} files ({format_size(wasted)}), "
+                         f"{format_size(finder.bytes_hashed)} hashed, {finder.cache_hits} hashes cached")
+        return duplicates
+
+    def link_duplicates(self, duplicates):
+        """Replace each duplicate with a hard link to the copy being kept.
+
+        Runs before any file is moved, while every keeper is still at the
+        path it was found at. Returns each duplicate's outcome: True when
+        linked, False when it already was, or the OSError that stopped it.
+        """
+        results = {}
+        for file_path, keeper in duplicates.items():
+            try:
+                if os.path.samefile(file_path, keeper):
+                    results[file_path] = False
+                    continue
+                temp_path = file_path.with_name(f".{file_path.name}.link")
+                os.link(keeper, temp_path)
+                os.replace(temp_path, file_path)
+                results[file_path] = True
+            except OSError as e:
+                results[file_path] = e
+        return results
+
+    def organize_directory(self, source_dir, dry_run=False, recursive=False, workers=1):
         """Organize files in the specified directory."""
         source_path = Path(source_dir)
         
         if not source_path.exists():
-            print(f"❌ Directory '{source_dir}' does not exist!")
+            self.report.error(f"❌ Directory '{source_dir}' does not exist!")
             return
 
         if not source_path.is_dir():
-            print(f"❌ '{source_dir}' is not a directory!")
+            self.report.error(f"❌ '{source_dir}' is not a directory!")
             return
 
-        print(f"🔍 Scanning directory: {source_path}")
-        print(f"{'🧪 DRY RUN MODE - No files will be moved!' if dry_run else '📦 Organizing files...'}")
-        print("-" * 60)
+        self.report.info(f"🔍 Scanning directory: {source_path}")
+        self.report.info(f"{'🧪 DRY RUN MODE - No files will be moved!' if dry_run else '📦 Organizing files...'}")
+        self.report.info("-" * 60)
 
-        files_to_organize = []
-        
-        # Scan for files
-        for item in source_path.iterdir():
-            if item.is_file() and not item.name.startswith('.'):
-                files_to_organize.append(item)
+        journal = None
+        if self.journal and not dry_run:
+            journal = MoveJournal(self.journal_path(source_path), source_path)
+            self.resume_interrupted(source_path, journal)
 
-        if not files_to_organize:
-            print("📝 No files to organize!")
-            return
+        # Scan for files; when recursing, skip the category folders we fill
+        skip_dirs = set(self.rules.categories)
+
+        cache = None
+        if self.sniff or self.dedup:
+            cache = FileCache(self.cache_file or source_path / CACHE_NAME)
+        if self.sniff:
+            self.sniffer = ContentSniffer(cache)
+            skip_dirs |= self.sniffer.categories
 
-        # Group files by category
+        # Previews without duplicate detection are reported while scanning,
+        # without keeping the file list in memory
+        stream = dry_run and not self.dedup and self.report.streams
+
+        # Group files by category; DirEntry.stat() is cached for size/age rules
         categorized_files = defaultdict(list)
-        for file_path in files_to_organize:
-            category = self.get_file_category(file_path)
-            categorized_files[category].append(file_path)
+        file_stats = {}
+        for entry in self.scan_files(str(source_path), recursive, skip_dirs):
+            file_path = Path(entry.path)
+            category = self.get_file_category(file_path, entry.stat)
+            stat_result = entry.stat()
+            if stream:
+                display_name = file_path.relative_to(source_path) if recursive else file_path.name
+                self.report.file('would_move', display_name, category, f"{category}/", stat_result.st_size)
+                self.stats[category] += 1
+                self.bytes[category] += stat_result.st_size
+                continue
+            categorized_files[category].append((file_path, stat_result.st_size))
+            if self.dedup:
+                file_stats[file_path] = stat_result
+
+        if self.sniffer:
+            self.report.info(f"🔎 Content sniffing: {self.sniffer.reads} files read, {self.sniffer.hits} cached")
+        duplicates = {}
+        if self.dedup:
+            duplicates = self.find_duplicates(source_path, categorized_files, file_stats, cache, workers)
+        if cache:
+            cache.save()
+
+        if not categorized_files and not self.stats:
+            self.report.info("📝 No files to organize!")
+            return
+
+        links = {}
+        if self.dedup == 'hardlink' and not dry_run:
+            links = self.link_duplicates(duplicates)
+
+        if journal and categorized_files:
+            journal.start()
 
         # Organize files
-        for category, files in categorized_files.items():
-            category_folder = source_path / category
-            
-            if not dry_run:
-                self.create_folder_if_not_exists(category_folder)
-
-            print(f"\n📂 {category} ({len(files)} files):")
-            
-            for file_path in files:
-                destination = category_folder / file_path.name
-                
-                if dry_run:
-                    print(f"   Would move: {file_path.name} → {category}/")
-                else:
-                    try:
-                        # Handle file name conflicts
-                        counter = 1
-                        original_destination = destination
-                        while destination.exists():
-                            stem = original_destination.stem
-                            suffix = original_destination.suffix
-                            destination = category_folder / f"{stem}_{counter}{suffix}"
-                            counter += 1
-
-                        shutil.move(str(file_path), str(destination))
-                        print(f"   ✅ Moved: {file_path.name} → {category}/")
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for category, files in categorized_files.items():
+                category_folder = source_path / category
+
+                if not dry_run:
+                    self.create_folder_if_not_exists(category_folder)
+
+                self.report.category(category, len(files))
+
+                moves = []
+                for file_path, size in files:
+                    display_name = file_path.relative_to(source_path) if recursive else file_path.name
+
+                    keeper = duplicates.get(file_path)
+                    if keeper:
+                        keeper_name = keeper.relative_to(source_path)
+                        if self.dedup == 'skip':
+                            self.report.file('skipped_duplicate', display_name, category, '', size, keeper_name)
+                            self.duplicates += 1
+                            continue
+                        if self.dedup == 'hardlink':
+                            if dry_run:
+                                self.report.file('would_hardlink', display_name, category, '', size, keeper_name)
+                            elif isinstance(links[file_path], OSError):
+                                self.report.error(f"   ❌ Cannot hardlink {display_name}: {links[file_path]}")
+                            elif links[file_path]:
+                                self.report.file('hardlinked', display_name, category, '', 0, keeper_name)
+                                self.duplicates += 1
+                        else:
+                            self.report.file('duplicate', display_name, category, '', size, keeper_name)
+
+                    if dry_run:
+                        self.report.file('would_move', display_name, category, f"{category}/", size)
                         self.stats[category] += 1
-                        
-                    except Exception as e:
-                        print(f"   ❌ Error moving {file_path.name}: {e}")
+                        self.bytes[category] += size
+                    else:
+                        moves.append((file_path, display_name, size))
+
+                for start in range(0, len(moves), JOURNAL_GROUP):
+                    self.move_group(moves[start:start + JOURNAL_GROUP], category, category_folder,
+                                    executor, workers, journal)
+
+        if journal and categorized_files:
+            journal.finish()
+            journal.close()
 
         self.print_summary(dry_run)
 
+    def watch_files(self, source_path, ready, stop, settle, stats, ignore=()):
+        """Feed files that stopped changing for settle seconds into the ready queue."""
+        watcher = make_watcher(source_path)
+        # name -> [(size, mtime_ns), time of last change, time first seen]
+        pending = {}
+        names = None
+        while not stop.is_set():
+            if names is None:
+                # First pass, or the kernel dropped events: list the directory again
+                with os.scandir(source_path) as entries:
+                    names = {entry.name for entry in entries}
+            now = time.monotonic()
+            for name in names:
+                if not name.startswith('.') and name not in pending and name not in ignore:
+                    pending[name] = [None, now, now]
+
+            for name, state in list(pending.items()):
+                try:
+                    stat_result = os.stat(source_path / name)
+                except OSError:
+                    del pending[name]
+                    continue
+                if not S_ISREG(stat_result.st_mode):
+                    del pending[name]
+                    continue
+                signature = (stat_result.st_size, stat_result.st_mtime_ns)
+                if signature != state[0]:
+                    # Still growing (or just seen): restart its quiet period
+                    state[0], state[1] = signature, now
+                elif now - state[1] >= settle:
+                    del pending[name]
+                    item = (source_path / name, stat_result.st_size, state[2])
+                    # A bounded queue: wait here while the movers catch up
+                    while not stop.is_set():
+                        try:
+                            ready.put(item, timeout=WATCH_POLL_INTERVAL)
+                            break
+                        except queue.Full:
+                            continue
+
+            stats.pending = len(pending)
+            timeout = min(settle, WATCH_POLL_INTERVAL) if pending else WATCH_POLL_INTERVAL
+            names = watcher.changes(timeout)
+
+    def watch_directory(self, source_dir, workers=1, settle=2.0, batch_size=100, queue_size=1000,
+                        stats_interval=10.0, status_file=None):
+        """Organize files as they arrive in source_dir until interrupted."""
+        source_path = Path(source_dir)
+
+        if not source_path.is_dir():
+            self.report.error(f"❌ '{source_dir}' is not a directory!")
+            return
+
+        cache = None
+        if self.sniff:
+            cache = FileCache(self.cache_file or source_path / CACHE_NAME)
+            self.sniffer = ContentSniffer(cache)
+
+        self.report.info(f"👀 Watching directory: {source_path}")
+        self.report.info(f"   Files are moved after {settle:g}s without changes, in batches of up to {batch_size}")
+        self.report.info("-" * 60)
+
+        # Don't organize our own status file if it lives in the watched directory
+        ignore = set()
+        if status_file and Path(status_file).resolve().parent == source_path.resolve():
+            ignore = {Path(status_file).name, Path(status_file).name + '.tmp'}
+
+        stats = WatchStats()
+        last_cache_save = time.monotonic()
+        ready = queue.Queue(maxsize=max(1, queue_size))
+        stop = threading.Event()
+        scanner = threading.Thread(target=self.watch_files, args=(source_path, ready, stop, settle, stats, ignore),
+                                   name='organizer-watch', daemon=True)
+        scanner.start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                while True:
+                    batch = []
+                    try:
+                        batch.append(ready.get(timeout=WATCH_POLL_INTERVAL))
+                        while len(batch) < batch_size:
+                            batch.append(ready.get_nowait())
+                    except queue.Empty:
+                        pass
+
+                    if batch:
+                        self.move_batch(source_path, batch, executor, stats)
+                    if cache and time.monotonic() - last_cache_save >= WATCH_CACHE_INTERVAL:
+                        cache.save()
+                        last_cache_save = time.monotonic()
+
+                    stats.queued = ready.qsize()
+                    if time.monotonic() - stats.last_report >= stats_interval:
+                        self.report.info(stats.line())
+                        if status_file:
+                            stats.write(status_file)
+        except KeyboardInterrupt:
+            self.report.info("\n\n⏹️ Stopped watching.")
+        finally:
+            stop.set()
+            scanner.join()
+            if cache:
+                cache.save()
+            self.report.info(stats.line())
+            if status_file:
+                stats.write(status_file)
+
+    def move_batch(self, source_path, batch, executor, stats):
+        """Classify and move one batch of settled files."""
+        # Category folders may have changed between batches; list them again
+        with self.lock:
+            self.taken_names.clear()
+            self.next_counter.clear()
+
+        moves = []
+        for file_path, size, first_seen in batch:
+            try:
+                category = self.get_file_category(file_path)
+            except OSError:
+                stats.record(False, size, 0)
+                continue
+            category_folder = source_path / category
+            self.create_folder_if_not_exists(category_folder)
+            future = executor.submit(self.move_file, file_path, category, category_folder, file_path.name, None, size)
+            moves.append((future, size, first_seen))
+
+        for future, size, first_seen in moves:
+            stats.record(future.result(), size, time.monotonic() - first_seen)
+        stats.batches += 1
+
     def print_summary(self, dry_run=False):
         """Print organization summary."""
-        print("\n" + "=" * 60)
-        print(f"📊 {'PREVIEW' if dry_run else 'ORGANIZATION'} SUMMARY")
-        print("=" * 60)
-        
-        if not dry_run and self.stats:
-            total_files = sum(self.stats.values())
-            print(f"Total files organized: {total_files}")
-            print("\nFiles by category:")
-            for category, count in sorted(self.stats.items()):
-                print(f"  {category}: {count} files")
-        elif dry_run:
-            print("Run without --dry-run to actually organize the files.")
-        else:
-            print("No files were organized.")
+        self.report.summary({
+            'dry_run': dry_run,
+            'files': sum(self.stats.values()),
+            'bytes': sum(self.bytes.values()),
+            'categories': {category: {'files': count, 'bytes': self.bytes[category]}
+                           for category, count in sorted(self.stats.items())},
+            'failed': self.failed,
+            'duplicates': self.duplicates,
+            'dedup': self.dedup,
+            'strategies': {strategy: dict(totals) for strategy, totals in sorted(self.mover.stats.items())},
+        })
 
 def main():
     parser = argparse.ArgumentParser(
@@ -130,6 +1631,13 @@ Examples:
   python organizer.py /path/to/directory
   python organizer.py ~/Downloads --dry-run
   python organizer.py . --dry-run
+  python organizer.py /data/ingest --recursive --workers 8
+  python organizer.py ~/Downloads --config rules.toml
+  python organizer.py ~/Downloads --sniff
+  python organizer.py ~/Downloads --dedup skip
+  python organizer.py /data/dropbox --watch --status-file status.json
+  python organizer.py ~/Downloads --undo
+  python organizer.py /data --recursive --dry-run --format ndjson > plan.ndjson
         """
     )
     
@@ -146,16 +1654,133 @@ Examples:
         help='Preview what would be organized without actually moving files'
     )
 
+    parser.add_argument(
+        '--recursive', '-r',
+        action='store_true',
+        help='Also organize files in subdirectories (moved into the top-level category folders)'
+    )
+
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Number of threads moving files in parallel (default: 1)'
+    )
+
+    parser.add_argument(
+        '--config', '-c',
+        metavar='FILE',
+        help='JSON or TOML file with extra categories and glob/regex/size/age rules'
+    )
+
+    parser.add_argument(
+        '--sniff',
+        action='store_true',
+        help='Classify files with unknown extensions by their first bytes'
+    )
+
+    parser.add_argument(
+        '--cache',
+        metavar='FILE',
+        help=f'File remembering sniffed types and hashes between runs (default: DIRECTORY/{CACHE_NAME})'
+    )
+
+    parser.add_argument(
+        '--dedup',
+        choices=DEDUP_MODES,
+        help='Find identical files and report them, skip moving them, or replace them with hard links'
+    )
+
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and organize new files as they arrive'
+    )
+
+    parser.add_argument(
+        '--settle',
+        type=float,
+        default=2.0,
+        help='Seconds a file must stop changing before it is moved in watch mode (default: 2)'
+    )
+
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=100,
+        help='Most files moved per batch in watch mode (default: 100)'
+    )
+
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=1000,
+        help='Most settled files waiting to be moved in watch mode (default: 1000)'
+    )
+
+    parser.add_argument(
+        '--stats-interval',
+        type=float,
+        default=10.0,
+        help='Seconds between stats lines in watch mode (default: 10)'
+    )
+
+    parser.add_argument(
+        '--status-file',
+        metavar='FILE',
+        help='Write watch mode counters to FILE as JSON at every stats line'
+    )
+
+    parser.add_argument(
+        '--journal',
+        metavar='FILE',
+        help=f'Move journal used to resume and undo runs (default: DIRECTORY/{JOURNAL_NAME})'
+    )
+
+    parser.add_argument(
+        '--no-journal',
+        action='store_true',
+        help='Do not record moves (runs can then not be resumed or undone)'
+    )
+
+    parser.add_argument(
+        '--undo',
+        action='store_true',
+        help='Move the files of the latest run back where they came from'
+    )
+
+    parser.add_argument(
+        '--format',
+        choices=REPORT_FORMATS,
+        default='text',
+        help='Output format for files and the summary (default: text)'
+    )
+
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help='Only print errors and the summary, not every file'
+    )
+
     args = parser.parse_args()
 
-    organizer = FileOrganizer()
-    
+    report = make_reporter(args.format, args.quiet)
     try:
-        organizer.organize_directory(args.directory, args.dry_run)
+        organizer = FileOrganizer(args.config, args.sniff, args.cache, args.dedup,
+                                  not args.no_journal, args.journal, report)
+        if args.undo:
+            organizer.undo(args.directory, args.dry_run)
+        elif args.watch:
+            organizer.watch_directory(args.directory, args.workers, args.settle, args.batch_size,
+                                      args.queue_size, args.stats_interval, args.status_file)
+        else:
+            organizer.organize_directory(args.directory, args.dry_run, args.recursive, args.workers)
     except KeyboardInterrupt:
-        print("\n\n⏹️ Organization cancelled by user.")
+        report.error("\n\n⏹️ Organization cancelled by user.")
     except Exception as e:
-        print(f"\n❌ An error occurred: {e}")
+        report.error(f"\n❌ An error occurred: {e}")
+    finally:
+        report.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from pathlib import Path
+from datetime import date, timedelta
+
+GENERATOR = Path(__file__).resolve().parent / 'blog_generator.py'
+
+WORDS = (
+    "python code blog static site markdown template render build cache index page post "
+    "tag feed speed memory process worker queue file disk network stream parse token "
+    "syntax highlight style layout content author date title excerpt summary release "
+    "profile benchmark corpus sample random value result error change update"
+).split()
+
+LANGUAGES = ['python', 'javascript', 'rust', 'go', 'bash', 'sql', 'c', 'html']
+
+CODE_SNIPPETS = {
+    'python': "def {name}(items):\n    return [item * 2 for item in items if item > {n}]\n",
+    'javascript': "function {name}(items) {{\n  return items.filter(x => x > {n}).map(x => x * 2);\n}}\n",
+    'rust': "fn {name}(items: &[i32]) -> Vec<i32> {{\n    items.iter().filter(|x| **x > {n}).map(|x| x * 2).collect()\n}}\n",
+    'go': "func {name}(items []int) []int {{\n\tout := []int{{}}\n\tfor _, x := range items {{\n\t\tif x > {n} {{ out = append(out, x*2) }}\n\t}}\n\treturn out\n}}\n",
+    'bash': "for f in *.md; do\n  echo \"{name} $f\" | head -n {n}\ndone\n",
+    'sql': "SELECT id, title FROM posts WHERE views > {n} ORDER BY {name} DESC;\n",
+    'c': "int {name}(int *items, int len) {{\n    int total = 0;\n    for (int i = 0; i < len; i++) if (items[i] > {n}) total += items[i];\n    return total;\n}}\n",
+    'html': "<div class=\"{name}\">\n  <p>Item {n}</p>\n</div>\n",
+}
+
+SCENARIOS = ('cold', 'warm', 'noop', 'incremental')
+
+class CorpusGenerator:
+    def __init__(self, seed=42, min_paragraphs=2, max_paragraphs=30, code_density=0.3,
+                 tag_cardinality=50, snippet_variety=200):
+        self.random = random.Random(seed)
+        self.min_paragraphs = min_paragraphs
+        self.max_paragraphs = max_paragraphs
+        self.code_density = code_density
+        self.tags = [f"{self.random.choice(WORDS)}-{i}" for i in range(tag_cardinality)]
+        self.snippet_variety = snippet_variety
+
+    def sentence(self):
+        words = [self.random.choice(WORDS) for _ in range(self.random.randint(6, 18))]
+        return ' '.join(words).capitalize() + '.'
+
+    def paragraph(self):
+        return ' '.join(self.sentence() for _ in range(self.random.randint(2, 6)))
+
+    def code_block(self):
+        lang = self.random.choice(LANGUAGES)
+        # A bounded pool of snippets, like real posts that reuse examples
+        variant = self.random.randrange(self.snippet_variety)
+        code = CODE_SNIPPETS[lang].format(name=f"{self.random.choice(WORDS)}_{variant % 7}", n=variant)
+        return f"```{lang}\n{code}```"
+
+    def post(self, number):
+        # Log-uniform sizes: many short posts and a long tail of big ones
+        paragraphs = int(round(self.min_paragraphs * (self.max_paragraphs / self.min_paragraphs) ** self.random.random()))
+        published = date(2015, 1, 1) + timedelta(days=self.random.randrange(3650))
+        tags = self.random.sample(self.tags, k=min(len(self.tags), self.random.randint(1, 4)))
+
+        lines = [
+            '---',
+            f"title: Post {number} {self.random.choice(WORDS).title()} {self.random.choice(WORDS).title()}",
+            f"date: {published.isoformat()}",
+            f"author: Author {self.random.randrange(20)}",
+            f"tags: {', '.join(tags)}",
+            '---',
+            '',
+            f"# Post {number}",
+            '',
+        ]
+        for i in range(paragraphs):
+            if i and i % 5 == 0:
+                lines += [f"## Section {i // 5}", '']
+            lines += [self.paragraph(), '']
+            if self.random.random() < self.code_density:
+                lines += [self.code_block(), '']
+        return '\n'.join(lines)
+
+    def write(self, directory, count):
+        directory = Path(directory)
+        if directory.exists():
+            shutil.rmtree(directory)
+        directory.mkdir(parents=True)
+
+        total = 0
+        for number in range(count):
+            content = self.post(number)
+            (directory / f"post-{number:06d}.md").write_text(content, encoding='utf-8')
+            total += len(content)
+        return total
+
+class BlogBenchmark:
+    def __init__(self, workdir, jobs=1, stream=False, touch_fraction=0.01, seed=42):
+        self.workdir = Path(workdir)
+        self.jobs = jobs
+        self.stream = stream
+        self.touch_fraction = touch_fraction
+        self.seed = seed
+
+    def run_build(self, corpus, output, cache, full=False):
+        """Run one build in a subprocess and return wall time, peak RSS and stage timings."""
+        profile_file = self.workdir / 'profile.json'
+        command = [
+            sys.executable, str(GENERATOR),
+            '--source', str(corpus), '--output', str(output), '--cache-dir', str(cache),
+            '--jobs', str(self.jobs), '--profile-json', str(profile_file),
+        ]
+        if full:
+            command.append('--full')
+        if self.stream:
+            command.append('--stream')
+
+        # stderr goes to a file: a pipe nobody reads while waiting fills up and stalls the build
+        with tempfile.TemporaryFile() as stderr_file:
+            start = time.perf_counter()
+            process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=stderr_file)
+            # wait4 reports the peak RSS of the largest process in this build's process tree
+            _, status, usage = os.wait4(process.pid, 0)
+            wall = time.perf_counter() - start
+            process.returncode = os.waitstatus_to_exitcode(status)
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode('utf-8', 'replace')
+        if process.returncode != 0:
+            raise RuntimeError(f"build failed ({process.returncode}): {stderr.strip()}")
+
+        with open(profile_file, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        peak_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+        return {
+            'wall': wall,
+            'cpu': usage.ru_utime + usage.ru_stime,
+            'peak_rss_mb': peak_rss / 1048576,
+            'posts': profile['settings'].get('posts', 0),
+            'rebuilt': profile['settings'].get('rebuilt', 0),
+            'stages': {name: {'wall': totals['wall'], 'cpu': totals['cpu'], 'bytes': totals['bytes']}
+                       for name, totals in profile['stages'].items()},
+        }
+
+    def touch_posts(self, corpus):
+        """Append a paragraph to a fraction of the posts, as an editing session would."""
+        files = sorted(Path(corpus).glob('*.md'))
+        picker = random.Random(self.seed)
+        chosen = picker.sample(files, k=max(1, int(len(files) * self.touch_fraction)))
+        for md_file in chosen:
+            with open(md_file, 'a', encoding='utf-8') as f:
+                f.write("\nAn edit made by the benchmark.\n")
+        return len(chosen)
+
+    def run_size(self, count, corpus_options):
+        """Benchmark all scenarios for one corpus size."""
+        corpus = self.workdir / f"corpus-{count}"
+        output = self.workdir / f"output-{count}"
+        cache = self.workdir / f"cache-{count}"
+
+        print(f"\n📚 Generating {count} posts...")
+        corpus_bytes = CorpusGenerator(seed=self.seed, **corpus_options).write(corpus, count)
+        for directory in (output, cache):
+            if directory.exists():
+                shutil.rmtree(directory)
+
+        results = {}
+        for scenario in SCENARIOS:
+            if scenario == 'incremental':
+                self.touch_posts(corpus)
+            result = self.run_build(corpus, output, cache, full=scenario in ('cold', 'warm'))
+            result['posts_per_sec'] = result['posts'] / result['wall'] if result['wall'] else 0.0
+            results[scenario] = result
+            print(f"   {scenario:<12} {result['wall']:>8.2f} s  {result['posts_per_sec']:>10.1f} posts/s  "
+                  f"{result['peak_rss_mb']:>8.1f} MB peak  ({result['rebuilt']} rebuilt)")
+
+        return {'posts': count, 'corpus_bytes': corpus_bytes, 'scenarios': results}
+
+    def run(self, sizes, corpus_options):
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        return {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'settings': {
+                'jobs': self.jobs,
+                'stream': self.stream,
+                'touch_fraction': self.touch_fraction,
+                'seed': self.seed,
+                'corpus': corpus_options,
+            },
+            'runs': [self.run_size(count, corpus_options) for count in sizes],
+        }
+
+def compare_to_baseline(report, baseline, max_regression):
+    """Return the scenarios whose posts/sec dropped more than max_regression."""
+    regressions = []
+    baseline_runs = {run['posts']: run for run in baseline.get('runs', [])}
+    for run in report['runs']:
+        previous = baseline_runs.get(run['posts'])
+        if not previous:
+            continue
+        for scenario, result in run['scenarios'].items():
+            before = previous['scenarios'].get(scenario, {}).get('posts_per_sec')
+            if not before:
+                continue
+            change = (result['posts_per_sec'] - before) / before
+            if change < -max_regression:
+                regressions.append((run['posts'], scenario, before, result['posts_per_sec'], change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark blog_generator.py on synthetic post corpora")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000], help='Corpus sizes to benchmark, e.g. 1000 10000 100000')
+    parser.add_argument('--workdir', default='bench', help='Directory for corpora, outputs and caches')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='--jobs passed to the generator')
+    parser.add_argument('--stream', action='store_true', help='Benchmark streaming builds')
+    parser.add_argument('--min-paragraphs', type=int, default=2, help='Smallest post size in paragraphs')
+    parser.add_argument('--max-paragraphs', type=int, default=30, help='Largest post size in paragraphs')
+    parser.add_argument('--code-density', type=float, default=0.3, help='Chance of a code block after each paragraph')
+    parser.add_argument('--tag-cardinality', type=int, default=50, help='Number of distinct tags in the corpus')
+    parser.add_argument('--touch-fraction', type=float, default=0.01, help='Fraction of posts edited before the incremental build')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for corpus generation')
+    parser.add_argument('--json', metavar='FILE', help='Save the machine-readable report to FILE')
+    parser.add_argument('--baseline', metavar='FILE', help='Compare posts/sec against a previous --json report')
+    parser.add_argument('--max-regression', type=float, default=0.1, help='Allowed posts/sec drop versus the baseline (0.1 = 10%%)')
+
+    args = parser.parse_args()
+
+    corpus_options = {
+        'min_paragraphs': args.min_paragraphs,
+        'max_paragraphs': args.max_paragraphs,
+        'code_density': args.code_density,
+        'tag_cardinality': args.tag_cardinality,
+    }
+    benchmark = BlogBenchmark(args.workdir, jobs=args.jobs, stream=args.stream,
+                              touch_fraction=args.touch_fraction, seed=args.seed)
+    report = benchmark.run(args.sizes, corpus_options)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.max_regression)
+        if regressions:
+            print("\n❌ Performance regressions:")
+            for posts, scenario, before, after, change in regressions:
+                print(f"   {posts} posts / {scenario}: {before:.1f} → {after:.1f} posts/s ({change:+.0%})")
+            sys.exit(1)
+        print("\n✅ No regressions against the baseline")
+
+if __name__ == "__main__":
+    main()
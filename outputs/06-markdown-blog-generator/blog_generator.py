@@ -1,18 +1,877 @@
 #!/usr/bin/env python3
 import os
 import re
+import json
+import html
+import hashlib
+import sqlite3
 import markdown
+import pygments
+from markdown.extensions import Extension
+from markdown.extensions.attr_list import get_attrs
+from markdown.extensions.codehilite import CodeHilite, parse_hl_lines
+from markdown.postprocessors import Postprocessor
 from pathlib import Path
 from datetime import datetime
-from jinja2 import Template
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import cProfile
+import ctypes
+import ctypes.util
+import platform
+import select
+import struct
+import tempfile
+import threading
+import time
+from jinja2 import Environment, DictLoader, FileSystemBytecodeCache
 import argparse
 
+MANIFEST_NAME = '.manifest.json'
+MANIFEST_VERSION = 3
+
+# Parallel rendering: target bytes and max posts per worker task
+BATCH_BYTES = 256 * 1024
+BATCH_POSTS = 64
+
+MARKDOWN_EXTENSIONS = ['codehilite', 'fenced_code', 'tables']
+
+# Pygments is run by CachedHighlightPostprocessor instead of codehilite itself
+MARKDOWN_EXTENSION_CONFIGS = {'codehilite': {'use_pygments': False}}
+HIGHLIGHT_OPTIONS = {'css_class': 'codehilite', 'guess_lang': True, 'pygments_style': 'default'}
+DEFAULT_HIGHLIGHT_CACHE_MB = 64
+# New highlight cache entries held in memory before they are written out
+HIGHLIGHT_FLUSH_ENTRIES = 256
+
+EXCERPT_LENGTH = 200
+DEFAULT_PAGE_SIZE = 20
+DEFAULT_FEED_SIZE = 20
+DEFAULT_BASE_URL = 'http://localhost:8000/'
+
+# Read the process umask once (it can only be queried by setting it)
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+# Watch mode: quiet period that ends a burst of saves, and polling interval
+WATCH_DEBOUNCE = 0.3
+WATCH_POLL_INTERVAL = 1.0
+
+POST_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{ post.title }} - My Blog</title>
+    <link rel="stylesheet" href="../styles.css">
+</head>
+<body>
+    <header>
+        <nav>
+            <a href="../index.html">← Back to Blog</a>
+        </nav>
+    </header>
+    
+    <main class="post-content">
+        <article>
+            <header class="post-header">
+                <h1>{{ post.title }}</h1>
+                <div class="post-meta">
+                    <span class="date">{{ post.date }}</span>
+                    <span class="author">by {{ post.author }}</span>
+                    {% if post.tags %}
+                    <div class="tags">
+                        {% for tag in post.tags %}
+                        <a class="tag" href="../tags/{{ tag | slug }}.html">{{ tag }}</a>
+                        {% endfor %}
+                    </div>
+                    {% endif %}
+                </div>
+            </header>
+            
+            <div class="post-body">
+                {{ post.content | safe }}
+            </div>
+        </article>
+    </main>
+</body>
+</html>
+"""
+
+POST_LIST_TEMPLATE = """
+        <div class="posts-list">
+            {% for post in posts %}
+            <article class="post-preview">
+                <h2><a href="{{ root }}posts/{{ post.slug }}.html">{{ post.title }}</a></h2>
+                <div class="post-meta">
+                    <span class="date">{{ post.date }}</span>
+                    <span class="author">by {{ post.author }}</span>
+                    {% if post.tags %}
+                    <div class="tags">
+                        {% for tag in post.tags %}
+                        <a class="tag" href="{{ root }}tags/{{ tag | slug }}.html">{{ tag }}</a>
+                        {% endfor %}
+                    </div>
+                    {% endif %}
+                </div>
+                <div class="post-excerpt">
+                    {{ post.excerpt | e }}...
+                </div>
+                <a href="{{ root }}posts/{{ post.slug }}.html" class="read-more">Read more →</a>
+            </article>
+            {% endfor %}
+        </div>
+"""
+
+INDEX_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>My Blog{% if page.number > 1 %} - Page {{ page.number }}{% endif %}</title>
+    <link rel="stylesheet" href="{{ root }}styles.css">
+    <link rel="alternate" type="application/atom+xml" title="My Blog" href="{{ root }}feed.xml">
+</head>
+<body>
+    <header>
+        <h1>📝 My Blog</h1>
+        <p>Welcome to my personal blog</p>
+    </header>
+    
+    <main>
+        {% include 'post-list.html' %}
+        {% if page.total > 1 %}
+        <nav class="pagination">
+            {% if page.previous %}<a href="{{ root }}{{ page.previous }}">← Newer posts</a>{% endif %}
+            <span>Page {{ page.number }} of {{ page.total }}</span>
+            {% if page.next %}<a href="{{ root }}{{ page.next }}">Older posts →</a>{% endif %}
+        </nav>
+        {% endif %}
+    </main>
+</body>
+</html>
+"""
+
+TAG_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Posts tagged "{{ tag }}" - My Blog</title>
+    <link rel="stylesheet" href="{{ root }}styles.css">
+</head>
+<body>
+    <header>
+        <nav>
+            <a href="{{ root }}index.html">← Back to Blog</a>
+        </nav>
+        <h1>🏷️ {{ tag }}</h1>
+        <p>{{ posts | length }} post{{ 's' if posts | length != 1 }}</p>
+    </header>
+    
+    <main>
+        {% include 'post-list.html' %}
+    </main>
+</body>
+</html>
+"""
+
+FEED_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <title>My Blog</title>
+    <id>{{ base_url | e }}</id>
+    <link href="{{ base_url | e }}"/>
+    <link rel="self" href="{{ base_url | e }}feed.xml"/>
+    <updated>{{ updated }}</updated>
+    {% for post in posts %}
+    <entry>
+        <title>{{ post.title | e }}</title>
+        <id>{{ base_url | e }}posts/{{ post.slug }}.html</id>
+        <link href="{{ base_url | e }}posts/{{ post.slug }}.html"/>
+        <updated>{{ post.date | atom_date }}</updated>
+        <author><name>{{ post.author | e }}</name></author>
+        {% for tag in post.tags %}
+        <category term="{{ tag | e }}"/>
+        {% endfor %}
+        <summary>{{ post.excerpt | e }}</summary>
+    </entry>
+    {% endfor %}
+</feed>
+"""
+
+TEMPLATES = {
+    'post.html': POST_TEMPLATE,
+    'post-list.html': POST_LIST_TEMPLATE,
+    'index.html': INDEX_TEMPLATE,
+    'tag.html': TAG_TEMPLATE,
+    'feed.xml': FEED_TEMPLATE,
+}
+
+def slugify(text):
+    """Generate URL-friendly slug from text."""
+    slug = re.sub(r'[^\w\s-]', '', text.lower())
+    slug = re.sub(r'[-\s]+', '-', slug)
+    return slug.strip('-')
+
+def _same_contents(path, size, digest):
+    """Check whether path already holds content of the given size and sha256 digest."""
+    try:
+        if os.stat(path).st_size != size:
+            return False
+    except FileNotFoundError:
+        return False
+    
+    existing = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            existing.update(block)
+    return existing.digest() == digest
+
+def write_if_changed(path, content):
+    """Atomically write text (a str or an iterable of str chunks) to path.
+
+    Identical files are left untouched so their mtime is preserved; changed
+    files are written to a temporary file next to path and renamed over it.
+    Returns (changed, size in bytes).
+    """
+    path = Path(path)
+    if isinstance(content, str):
+        data = content.encode('utf-8')
+        if _same_contents(path, len(data), hashlib.sha256(data).digest()):
+            return False, len(data)
+        content = [content]
+    
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in content:
+                data = chunk.encode('utf-8')
+                digest.update(data)
+                size += len(data)
+                f.write(data)
+        
+        if _same_contents(path, size, digest.digest()):
+            os.unlink(temp_path)
+            return False, size
+        
+        # mkstemp creates 0600 files; give the output normal permissions
+        os.chmod(temp_path, 0o666 & ~UMASK)
+        os.replace(temp_path, path)
+        return True, size
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+def atom_date(date):
+    """Turn a YYYY-MM-DD frontmatter date into an Atom timestamp."""
+    return date if 'T' in date else f"{date}T00:00:00Z"
+
+class StageTimer:
+    """Context manager charging the self time of one stage to a BuildProfiler."""
+
+    __slots__ = ('profiler', 'name', 'post', 'bytes', 'start_wall', 'start_cpu', 'child_wall', 'child_cpu')
+
+    def __init__(self, profiler, name, post):
+        self.profiler = profiler
+        self.name = name
+        self.post = post
+        self.bytes = 0
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+
+    def __enter__(self):
+        stack = self.profiler.stack
+        if self.post is None and stack:
+            self.post = stack[-1].post
+        stack.append(self)
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.process_time() - self.start_cpu
+        stack = self.profiler.stack
+        stack.pop()
+        # Nested stages (e.g. highlight inside markdown) are not counted twice
+        if stack:
+            stack[-1].child_wall += wall
+            stack[-1].child_cpu += cpu
+        self.profiler.record(self.name, self.post, wall - self.child_wall, cpu - self.child_cpu, self.bytes)
+
+class NullTimer:
+    """Stand-in for StageTimer when profiling is off."""
+
+    bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+NULL_TIMER = NullTimer()
+
+class BuildProfiler:
+    """Wall time, CPU time and bytes per build stage and per post."""
+
+    STAGES = ('scan', 'read', 'parse', 'markdown', 'highlight', 'template', 'write')
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stack = []
+        self.reset()
+
+    def reset(self):
+        self.stages = {name: {'wall': 0.0, 'cpu': 0.0, 'bytes': 0, 'calls': 0} for name in self.STAGES}
+        self.posts = {}
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+
+    def stage(self, name, post=None):
+        """Time a stage; post defaults to the post of the enclosing stage."""
+        if not self.enabled:
+            return NULL_TIMER
+        return StageTimer(self, name, post)
+
+    def record(self, name, post, wall, cpu, nbytes):
+        totals = self.stages[name]
+        totals['wall'] += wall
+        totals['cpu'] += cpu
+        totals['bytes'] += nbytes
+        totals['calls'] += 1
+        
+        if post is not None:
+            record = self.posts.setdefault(post, {'wall': 0.0, 'cpu': 0.0, 'bytes': 0, 'stages': {}})
+            record['wall'] += wall
+            record['cpu'] += cpu
+            record['bytes'] += nbytes
+            record['stages'][name] = record['stages'].get(name, 0.0) + wall
+
+    def drain(self):
+        """Return and clear what was recorded since the last drain (used by workers)."""
+        data = {'stages': self.stages, 'posts': self.posts}
+        self.reset()
+        return data
+
+    def merge(self, data):
+        """Add timings drained from a worker process."""
+        for name, totals in data['stages'].items():
+            for key, value in totals.items():
+                self.stages[name][key] += value
+        for post, record in data['posts'].items():
+            self.posts[post] = record
+
+    def report(self, top=10, settings=None):
+        """Build the JSON-serializable report."""
+        slowest = sorted(self.posts.items(), key=lambda item: item[1]['wall'], reverse=True)
+        return {
+            'created_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'markdown': markdown.__version__,
+            'pygments': pygments.__version__,
+            'settings': settings or {},
+            'wall': time.perf_counter() - self.start_wall,
+            'cpu': time.process_time() - self.start_cpu,
+            'stages': self.stages,
+            'slowest_posts': [dict(record, post=post) for post, record in slowest[:top]],
+            'posts': self.posts,
+        }
+
+    def print_report(self, top=10):
+        """Print stage totals and the slowest posts."""
+        report = self.report(top)
+        print(f"\n⏱️  Build profile ({report['wall'] * 1000:.0f} ms wall, {report['cpu'] * 1000:.0f} ms CPU in main process)")
+        print(f"   {'stage':<10} {'wall ms':>10} {'cpu ms':>10} {'MB':>9} {'calls':>8}")
+        for name, totals in report['stages'].items():
+            print(f"   {name:<10} {totals['wall'] * 1000:>10.1f} {totals['cpu'] * 1000:>10.1f} "
+                  f"{totals['bytes'] / 1048576:>9.2f} {totals['calls']:>8}")
+        
+        if report['slowest_posts']:
+            print(f"\n🐢 Slowest {len(report['slowest_posts'])} posts:")
+            for record in report['slowest_posts']:
+                breakdown = ', '.join(f"{name} {wall * 1000:.1f}" for name, wall in record['stages'].items())
+                print(f"   {record['wall'] * 1000:>8.1f} ms  {record['post']}  ({breakdown})")
+
+class TimedBytecodeCache(FileSystemBytecodeCache):
+    """Bytecode cache that records compile times so cache hits can be credited."""
+
+    def __init__(self, directory):
+        super().__init__(str(directory))
+        self.timings_file = Path(directory) / 'timings.json'
+        try:
+            with open(self.timings_file, 'r', encoding='utf-8') as f:
+                self.compile_times = json.load(f)
+        except (OSError, ValueError):
+            self.compile_times = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load_bytecode(self, bucket):
+        super().load_bytecode(bucket)
+        if bucket.code is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def record_compile(self, name, seconds):
+        self.compile_times[name] = seconds
+        with open(self.timings_file, 'w', encoding='utf-8') as f:
+            json.dump(self.compile_times, f)
+
+class HighlightCache:
+    """Persistent, size-bounded LRU cache of Pygments output.
+
+    Entries are keyed by (language, code hash, Pygments version, options) and
+    stored in SQLite so worker processes can share them. Without a cache
+    directory the cache lives in memory for the current process only.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_HIGHLIGHT_CACHE_MB * 1024 * 1024, profiler=None):
+        self.profiler = profiler or BuildProfiler()
+        path = ':memory:'
+        if cache_dir:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+            path = str(Path(cache_dir) / 'highlight.sqlite')
+        
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS highlight "
+            "(key TEXT PRIMARY KEY, html TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)"
+        )
+        self.pending = {}
+        self.touched = set()
+        self.hits = 0
+        self.misses = 0
+        self.options_key = json.dumps([pygments.__version__, HIGHLIGHT_OPTIONS], sort_keys=True)
+
+    def key(self, code, lang, shebang, options):
+        code_hash = hashlib.sha256(code.encode('utf-8')).hexdigest()
+        block_options = json.dumps([lang, shebang, options], sort_keys=True)
+        return hashlib.sha256(f"{block_options}\0{code_hash}\0{self.options_key}".encode('utf-8')).hexdigest()
+
+    def highlight(self, code, lang=None, shebang=False, options=None):
+        """Return highlighted HTML for a code block, running Pygments on a miss.
+
+        options are per-block CodeHilite arguments such as hl_lines, linenums
+        or css_class; with shebang, a #!lang or :::lang first line is parsed.
+        """
+        with self.profiler.stage('highlight'):
+            return self.lookup(code, lang, shebang, options or {})
+
+    def lookup(self, code, lang, shebang=False, options=None):
+        options = options or {}
+        key = self.key(code, lang, shebang, options)
+        cached = self.pending.get(key)
+        if cached is None:
+            row = self.db.execute("SELECT html FROM highlight WHERE key = ?", (key,)).fetchone()
+            cached = row[0] if row else None
+        
+        if cached is not None:
+            self.hits += 1
+            self.touched.add(key)
+            return cached
+        
+        self.misses += 1
+        options = dict(HIGHLIGHT_OPTIONS, **options)
+        highlighted = CodeHilite(code, lang=lang, style=options.pop('pygments_style'), **options).hilite(shebang=shebang)
+        self.pending[key] = highlighted
+        # Write out in chunks so a long streamed build doesn't hold every new block
+        if len(self.pending) >= HIGHLIGHT_FLUSH_ENTRIES:
+            self.flush()
+        return highlighted
+
+    def flush(self):
+        """Write new entries and refresh access times of hits."""
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO highlight (key, html, size, used) VALUES (?, ?, ?, ?)",
+                [(key, value, len(value), now) for key, value in self.pending.items()]
+            )
+            self.db.executemany("UPDATE highlight SET used = ? WHERE key = ?",
+                                [(now, key) for key in self.touched])
+        self.pending.clear()
+        self.touched.clear()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        self.flush()
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM highlight").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        doomed = []
+        for key, size in self.db.execute("SELECT key, size FROM highlight ORDER BY used"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        with self.db:
+            self.db.executemany("DELETE FROM highlight WHERE key = ?", doomed)
+
+class CachedHighlightPostprocessor(Postprocessor):
+    """Highlight the plain code blocks codehilite/fenced_code leave in the HTML stash.
+
+    Their processors are wrapped to note, for every stash entry they store,
+    the code and options codehilite itself would pass to Pygments (language,
+    hl_lines, linenums, extra classes), so the output matches a build with
+    use_pygments on. Raw HTML written by the author passes through unchanged,
+    even when it is a <pre><code>.
+    """
+
+    def __init__(self, md, cache):
+        super().__init__(md)
+        self.cache = cache
+        # Stash index -> (code, lang, shebang, options) for this conversion
+        self.code_blocks = {}
+
+    def track(self, processor, find_blocks):
+        """Record the block behind every stash entry a code-block processor stores.
+
+        find_blocks lists, in stash order, what the processor is about to
+        store, with None for blocks that must stay unhighlighted.
+        """
+        original_run = processor.run
+
+        def run(source):
+            found = find_blocks(processor, source)
+            start = len(self.md.htmlStash.rawHtmlBlocks)
+            result = original_run(source)
+            stored = range(start, len(self.md.htmlStash.rawHtmlBlocks))
+            # Should they ever disagree, leave the blocks as the processor stored them
+            if len(stored) == len(found):
+                self.code_blocks.update((i, block) for i, block in zip(stored, found) if block)
+            return result
+
+        processor.run = run
+
+    @staticmethod
+    def fenced_blocks(processor, lines):
+        """Fenced blocks in document order, with the options fenced_code gives CodeHilite."""
+        blocks = []
+        for match in processor.FENCED_BLOCK_RE.finditer("\n".join(lines)):
+            lang, classes, config = None, [], {}
+            if match.group('attrs'):
+                _, classes, config = processor.handle_attrs(get_attrs(match.group('attrs')))
+                if classes:
+                    lang = classes.pop(0)
+            else:
+                lang = match.group('lang') or None
+                if match.group('hl_lines'):
+                    config['hl_lines'] = parse_hl_lines(match.group('hl_lines'))
+            if not config.pop('use_pygments', True):
+                blocks.append(None)
+                continue
+            if classes:
+                config['css_class'] = f"{' '.join(classes)} {HIGHLIGHT_OPTIONS['css_class']}"
+            blocks.append((match.group('code'), lang, False, config))
+        return blocks
+
+    @staticmethod
+    def indented_blocks(processor, root):
+        """Indented code blocks in document order; codehilite reads #!lang headers from the code."""
+        return [(processor.code_unescape(block[0].text), None, True, {'tab_length': processor.md.tab_length})
+                for block in root.iter('pre') if len(block) == 1 and block[0].tag == 'code']
+
+    def run(self, text):
+        blocks = self.md.htmlStash.rawHtmlBlocks
+        for i, (code, lang, shebang, options) in self.code_blocks.items():
+            blocks[i] = self.cache.highlight(code, lang, shebang, options)
+        self.code_blocks.clear()
+        return text
+
+class CachedHighlightExtension(Extension):
+    """Route code highlighting through a HighlightCache."""
+
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+        self.postprocessor = None
+
+    def extendMarkdown(self, md):
+        md.registerExtension(self)
+        self.postprocessor = CachedHighlightPostprocessor(md, self.cache)
+        # Listed after codehilite and fenced_code, so their processors exist by now
+        for registry, name, find_blocks in (
+                (md.preprocessors, 'fenced_code_block', CachedHighlightPostprocessor.fenced_blocks),
+                (md.treeprocessors, 'hilite', CachedHighlightPostprocessor.indented_blocks)):
+            if name in registry:
+                self.postprocessor.track(registry[name], find_blocks)
+        # Runs before raw_html (30) restores the stashed blocks
+        md.postprocessors.register(self.postprocessor, 'cached_highlight', 35)
+
+    def reset(self):
+        # A conversion that failed part-way may have left indexes behind
+        if self.postprocessor:
+            self.postprocessor.code_blocks.clear()
+
+class RenderEngine:
+    """Long-lived Markdown converter and compiled Jinja templates.
+
+    One engine is created per process; the Markdown pipeline is built once and
+    reset() between documents, and templates are compiled once and persisted in
+    a bytecode cache so later runs skip compilation entirely.
+    """
+
+    def __init__(self, cache_dir=None, highlight_cache_mb=DEFAULT_HIGHLIGHT_CACHE_MB, profiler=None):
+        self.highlight_cache = HighlightCache(cache_dir, highlight_cache_mb * 1024 * 1024, profiler)
+        self.bytecode_cache = None
+        if cache_dir:
+            jinja_cache = Path(cache_dir) / 'jinja'
+            jinja_cache.mkdir(parents=True, exist_ok=True)
+            self.bytecode_cache = TimedBytecodeCache(jinja_cache)
+        
+        self.env = Environment(loader=DictLoader(TEMPLATES), bytecode_cache=self.bytecode_cache)
+        self.env.filters['slug'] = slugify
+        self.env.filters['atom_date'] = atom_date
+        self.templates = {}
+        self.md = None
+        self.stats = {
+            'converters': 0,
+            'conversions': 0,
+            'converter_setup': 0.0,
+            'template_loads': 0,
+            'template_cache_hits': 0,
+            'template_load_time': 0.0,
+            'template_time_saved': 0.0,
+        }
+
+    def convert(self, text):
+        """Convert Markdown to HTML, reusing the extension pipeline."""
+        if self.md is None:
+            self.md = self.build_converter()
+            # Time a second, import-free construction to credit each reuse fairly
+            start = time.perf_counter()
+            self.build_converter()
+            self.stats['converter_setup'] += time.perf_counter() - start
+            self.stats['converters'] += 1
+        else:
+            self.md.reset()
+        
+        self.stats['conversions'] += 1
+        return self.md.convert(text)
+
+    def build_converter(self):
+        """Build the Markdown pipeline with cached highlighting."""
+        return markdown.Markdown(
+            extensions=MARKDOWN_EXTENSIONS + [CachedHighlightExtension(self.highlight_cache)],
+            extension_configs=MARKDOWN_EXTENSION_CONFIGS
+        )
+
+    def snapshot_stats(self):
+        """Counters including highlight cache activity, for summaries and workers."""
+        stats = dict(self.stats)
+        stats['highlight_hits'] = self.highlight_cache.hits
+        stats['highlight_misses'] = self.highlight_cache.misses
+        return stats
+
+    def get_template(self, name):
+        """Load a template, compiling it at most once per process."""
+        template = self.templates.get(name)
+        if template is not None:
+            return template
+        
+        hits = self.bytecode_cache.hits if self.bytecode_cache else 0
+        start = time.perf_counter()
+        template = self.env.get_template(name)
+        elapsed = time.perf_counter() - start
+        
+        self.stats['template_loads'] += 1
+        self.stats['template_load_time'] += elapsed
+        if self.bytecode_cache:
+            if self.bytecode_cache.hits > hits:
+                self.stats['template_cache_hits'] += 1
+                compile_time = self.bytecode_cache.compile_times.get(name, elapsed)
+                self.stats['template_time_saved'] += max(0.0, compile_time - elapsed)
+            else:
+                self.bytecode_cache.record_compile(name, elapsed)
+        
+        self.templates[name] = template
+        return template
+
+    def time_saved(self):
+        """Estimate the seconds saved versus rebuilding converters and templates."""
+        stats = self.stats
+        saved = stats['template_time_saved']
+        if stats['converters']:
+            per_converter = stats['converter_setup'] / stats['converters']
+            saved += per_converter * (stats['conversions'] - stats['converters'])
+        return saved
+
+    def merge_stats(self, stats):
+        """Add counters reported by a worker process's engine."""
+        self.highlight_cache.hits += stats.pop('highlight_hits')
+        self.highlight_cache.misses += stats.pop('highlight_misses')
+        for key, value in stats.items():
+            self.stats[key] += value
+
+
+class InotifyWatcher:
+    """Report changed Markdown files in a directory using Linux inotify."""
+
+    # IN_MODIFY is left out so a save is reported once, on close
+    EVENTS = 0x008 | 0x040 | 0x080 | 0x100 | 0x200  # CLOSE_WRITE, MOVED_FROM/TO, CREATE, DELETE
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, path):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+        
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), self.EVENTS) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"cannot watch {path}")
+
+    def changes(self, timeout):
+        """Wait up to timeout seconds and return the names of changed posts."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        
+        buffer = os.read(self.fd, 64 * 1024)
+        names = set()
+        offset = 0
+        while offset < len(buffer):
+            _, _, _, length = self.EVENT_HEADER.unpack_from(buffer, offset)
+            offset += self.EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+            if name.endswith('.md'):
+                names.add(name)
+        return names
+
+class PollingWatcher:
+    """Fallback watcher that compares directory snapshots."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.name.endswith('.md') and entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def changes(self, timeout):
+        """Wait up to timeout seconds and return the names of changed posts."""
+        time.sleep(min(timeout, WATCH_POLL_INTERVAL))
+        current = self.scan()
+        names = {name for name in current.keys() | self.snapshot.keys()
+                 if current.get(name) != self.snapshot.get(name)}
+        self.snapshot = current
+        return names
+
+def make_watcher(path):
+    """Use inotify where the platform has it, otherwise poll."""
+    try:
+        return InotifyWatcher(path)
+    except (OSError, AttributeError):
+        return PollingWatcher(path)
+
+class Post:
+    """A processed post. Streaming builds keep only the listing fields and drop content."""
+
+    __slots__ = ('title', 'date', 'author', 'tags', 'slug', 'excerpt', 'filename', 'content', 'changed')
+
+    def __init__(self, metadata, slug, excerpt, filename, content=None, changed=False):
+        self.title = metadata['title']
+        self.date = metadata['date']
+        self.author = metadata['author']
+        self.tags = tuple(metadata['tags'])
+        self.slug = slug
+        self.excerpt = excerpt
+        self.filename = filename
+        self.content = content
+        self.changed = changed
+
 class BlogGenerator:
-    def __init__(self, source_dir="posts", output_dir="output"):
+    def __init__(self, source_dir="posts", output_dir="output", full_build=False, jobs=1,
+                 cache_dir=None, page_size=DEFAULT_PAGE_SIZE, stream=False,
+                 highlight_cache_mb=DEFAULT_HIGHLIGHT_CACHE_MB, feed_size=DEFAULT_FEED_SIZE,
+                 base_url=DEFAULT_BASE_URL, profile=False, profile_top=10, profile_json=None,
+                 changed_list=None, deleted_list=None):
         self.source_dir = Path(source_dir)
         self.output_dir = Path(output_dir)
+        self.full_build = full_build
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.page_size = page_size
+        self.stream = stream
+        self.page_keys = []
+        self.feed_size = feed_size
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.tag_index = {}
+        self.tag_keys = {}
+        self.feed_key = None
+        self.changed_files = []
+        self.deleted_files = []
+        self.changed_list = changed_list
+        self.deleted_list = deleted_list
+        self.highlight_cache_mb = highlight_cache_mb
+        self.profiler = BuildProfiler(profile or bool(profile_json))
+        self.profile_top = profile_top
+        self.profile_json = profile_json
+        self.engine = RenderEngine(cache_dir, highlight_cache_mb, self.profiler)
+        self.manifest_file = self.output_dir / MANIFEST_NAME
+        self.manifest = {}
+        self.manifest_entries = {}
+        self.stale_outputs = []
         self.posts = []
-        
+
+    def load_manifest(self):
+        """Load the build manifest written by the previous run."""
+        if self.full_build or not self.manifest_file.exists():
+            return {}
+
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest
+
+    def save_manifest(self):
+        """Persist source hashes, metadata and output paths for the next run."""
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'posts': self.manifest_entries,
+            'pages': self.page_keys,
+            'tags': self.tag_keys,
+            'feed': self.feed_key,
+        }
+        # The manifest is build state, so it is not reported as a changed output
+        with self.profiler.stage('write') as timer:
+            _, timer.bytes = write_if_changed(self.manifest_file, json.dumps(manifest))
+
+    def page_key(self, page, posts):
+        """Hash everything shown on one index page."""
+        listing = [page['number'], page['total']] + [
+            [post.title, post.date, post.author, post.tags, post.slug, post.excerpt]
+            for post in posts
+        ]
+        return hashlib.sha256(json.dumps(listing).encode('utf-8')).hexdigest()
+
     def parse_post_metadata(self, content):
         """Parse frontmatter metadata from markdown content."""
         metadata = {
@@ -44,11 +903,15 @@ class BlogGenerator:
         
         return metadata, content
 
+    def make_excerpt(self, html_content):
+        """Plain-text preview of the rendered post for index listings."""
+        text = re.sub(r'<[^>]*>', ' ', html_content)
+        text = re.sub(r'\s+', ' ', html.unescape(text)).strip()
+        return text[:EXCERPT_LENGTH]
+
     def generate_slug(self, title):
         """Generate URL-friendly slug from title."""
-        slug = re.sub(r'[^\w\s-]', '', title.lower())
-        slug = re.sub(r'[-\s]+', '-', slug)
-        return slug.strip('-')
+        return slugify(title)
 
     def process_posts(self):
         """Process all markdown files in the source directory."""
@@ -56,153 +919,364 @@ class BlogGenerator:
             print(f"❌ Source directory '{self.source_dir}' does not exist!")
             return
         
-        markdown_files = list(self.source_dir.glob('*.md'))
+        markdown_files = sorted(self.source_dir.glob('*.md'))
         
         if not markdown_files:
             print(f"📝 No markdown files found in '{self.source_dir}'")
-            return
+        else:
+            print(f"🔍 Found {len(markdown_files)} markdown files")
         
-        print(f"🔍 Found {len(markdown_files)} markdown files")
+        previous = self.manifest.get('posts', {})
+        errored = set()
+        reused = 0
+        pending = []
         
+        # First pass: reuse posts whose size and mtime match the manifest
         for md_file in markdown_files:
             try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                metadata, markdown_content = self.parse_post_metadata(content)
+                entry = previous.get(md_file.name)
+                with self.profiler.stage('scan'):
+                    stat = md_file.stat()
                 
-                # Convert markdown to HTML
-                html_content = markdown.markdown(
-                    markdown_content,
-                    extensions=['codehilite', 'fenced_code', 'tables']
-                )
+                if (entry and entry['size'] == stat.st_size
+                        and entry['mtime_ns'] == stat.st_mtime_ns
+                        and (self.output_dir / entry['output']).exists()):
+                    self.manifest_entries[md_file.name] = entry
+                    continue
                 
-                # Generate slug
-                slug = self.generate_slug(metadata['title'])
-                
-                post = {
-                    'title': metadata['title'],
-                    'date': metadata['date'],
-                    'author': metadata['author'],
-                    'tags': metadata['tags'],
-                    'slug': slug,
-                    'content': html_content,
-                    'filename': md_file.stem
-                }
-                
-                self.posts.append(post)
-                print(f"✅ Processed: {metadata['title']}")
+                if entry and not (self.output_dir / entry['output']).exists():
+                    entry = None
+                pending.append((md_file, stat, entry))
                 
             except Exception as e:
+                errored.add(md_file.name)
                 print(f"❌ Error processing {md_file}: {e}")
         
+        # Second pass: read, parse and convert everything else
+        rendered = {}
+        batch = [(str(md_file), entry['hash'] if entry else None) for md_file, _, entry in pending]
+        sizes = [stat.st_size for _, stat, _ in pending]
+        for (md_file, stat, entry), (ok, result) in zip(pending, self.render_posts(batch, sizes)):
+            if not ok:
+                errored.add(md_file.name)
+                print(f"❌ Error processing {md_file}: {result}")
+                continue
+            
+            # Touched but identical content
+            if result is None:
+                self.manifest_entries[md_file.name] = dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                continue
+            
+            metadata = result['metadata']
+            rendered[md_file.name] = result
+            if result['written']:
+                self.changed_files.append(f"posts/{result['slug']}.html")
+            self.manifest_entries[md_file.name] = {
+                'hash': result['hash'],
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'metadata': metadata,
+                'slug': result['slug'],
+                'excerpt': result['excerpt'],
+                'output': f"posts/{result['slug']}.html"
+            }
+        
+        # Assemble posts in source order so ties in the date sort are deterministic
+        for md_file in markdown_files:
+            entry = self.manifest_entries.get(md_file.name)
+            if entry is None:
+                continue
+            
+            result = rendered.get(md_file.name)
+            self.posts.append(Post(
+                entry['metadata'], entry['slug'], entry['excerpt'], md_file.stem,
+                content=result['content'] if result else None,
+                changed=result is not None
+            ))
+            
+            if result:
+                print(f"✅ Processed: {entry['metadata']['title']}")
+            else:
+                reused += 1
+        
+        if reused:
+            print(f"♻️  Reused {reused} unchanged posts")
+        
+        # Outputs of removed or renamed posts; failed posts keep their old page
+        current_outputs = {entry['output'] for entry in self.manifest_entries.values()}
+        self.stale_outputs = sorted({
+            entry['output'] for name, entry in previous.items()
+            if name not in errored and entry['output'] not in current_outputs
+        })
+        
         # Sort posts by date (newest first)
-        self.posts.sort(key=lambda x: x['date'], reverse=True)
+        self.posts.sort(key=lambda x: x.date, reverse=True)
+        self.build_tag_index()
 
-    def generate_post_pages(self):
-        """Generate individual post HTML pages."""
-        post_template = Template("""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{{ post.title }} - My Blog</title>
-    <link rel="stylesheet" href="../styles.css">
-</head>
-<body>
-    <header>
-        <nav>
-            <a href="../index.html">← Back to Blog</a>
-        </nav>
-    </header>
-    
-    <main class="post-content">
-        <article>
-            <header class="post-header">
-                <h1>{{ post.title }}</h1>
-                <div class="post-meta">
-                    <span class="date">{{ post.date }}</span>
-                    <span class="author">by {{ post.author }}</span>
-                    {% if post.tags %}
-                    <div class="tags">
-                        {% for tag in post.tags %}
-                        <span class="tag">{{ tag }}</span>
-                        {% endfor %}
-                    </div>
-                    {% endif %}
-                </div>
-            </header>
-            
-            <div class="post-body">
-                {{ post.content | safe }}
-            </div>
-        </article>
-    </main>
-</body>
-</html>
-        """)
+    def build_tag_index(self):
+        """Map each tag slug to (tag name, posts newest first) in one pass over the sorted posts."""
+        self.tag_index = {}
+        for post in self.posts:
+            for tag in post.tags:
+                tag_slug = slugify(tag)
+                if not tag_slug:
+                    continue
+                if tag_slug not in self.tag_index:
+                    self.tag_index[tag_slug] = (tag, [])
+                self.tag_index[tag_slug][1].append(post)
+
+    def render_post(self, md_file, known_hash=None):
+        """Read, parse and convert a single post.
+
+        Returns None if the source still hashes to known_hash.
+        """
+        with self.profiler.stage('read', md_file.stem) as timer:
+            with open(md_file, 'rb') as f:
+                raw = f.read()
+            timer.bytes = len(raw)
+        
+        source_hash = hashlib.sha256(raw).hexdigest()
+        if source_hash == known_hash:
+            return None
+        
+        with self.profiler.stage('parse', md_file.stem):
+            metadata, markdown_content = self.parse_post_metadata(raw.decode('utf-8'))
+        
+        # Convert markdown to HTML
+        with self.profiler.stage('markdown', md_file.stem):
+            html_content = self.engine.convert(markdown_content)
+        slug = self.generate_slug(metadata['title'])
+        excerpt = self.make_excerpt(html_content)
+        
+        # Streaming: write the page now and hand back only the listing metadata
+        written = False
+        if self.stream:
+            written = self.write_post_page(Post(metadata, slug, excerpt, md_file.stem, content=html_content))
+            html_content = None
         
+        return {
+            'hash': source_hash,
+            'metadata': metadata,
+            'slug': slug,
+            'content': html_content,
+            'excerpt': excerpt,
+            'written': written
+        }
+
+    def render_batch(self, batch):
+        """Render a batch of (path, known_hash) pairs, capturing per-file errors."""
+        results = []
+        for path, known_hash in batch:
+            try:
+                results.append((True, self.render_post(Path(path), known_hash)))
+            except Exception as e:
+                results.append((False, str(e)))
+        return results
+
+    def render_posts(self, batch, sizes):
+        """Render posts in-process or across a process pool, preserving order."""
+        if self.jobs <= 1 or len(batch) < 2:
+            return self.render_batch(batch)
+        
+        print(f"⚙️  Rendering {len(batch)} posts with {self.jobs} workers...")
+        
+        # Group small posts together so each task amortizes the IPC round trip
+        target = max(1, min(BATCH_BYTES, sum(sizes) // (self.jobs * 4)))
+        batches, current, current_bytes = [], [], 0
+        for item, size in zip(batch, sizes):
+            current.append(item)
+            current_bytes += size
+            if current_bytes >= target or len(current) >= BATCH_POSTS:
+                batches.append(current)
+                current, current_bytes = [], 0
+        if current:
+            batches.append(current)
+        
+        results = []
+        worker_stats = {}
+        with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker,
+                                 initargs=(self.output_dir, self.cache_dir, self.stream,
+                                           self.highlight_cache_mb, self.profiler.enabled)) as executor:
+            for pid, stats, profile, batch_results in executor.map(_render_batch, batches):
+                worker_stats[pid] = stats
+                if profile:
+                    self.profiler.merge(profile)
+                results.extend(batch_results)
+        
+        # Engine counters are cumulative per worker, so keep the last snapshot of each
+        for stats in worker_stats.values():
+            self.engine.merge_stats(stats)
+        return results
+
+    def write_output(self, output, content):
+        """Write an output file if its content changed and record it for deploy tooling."""
+        output_file = self.output_dir / output
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        changed, size = write_if_changed(output_file, content)
+        if changed:
+            self.changed_files.append(output)
+        return changed, size
+
+    def delete_output(self, output):
+        """Delete an output file and record the deletion."""
+        output_file = self.output_dir / output
+        if output_file.exists():
+            output_file.unlink()
+            self.deleted_files.append(output)
+            return True
+        return False
+
+    def remove_stale_outputs(self):
+        """Delete pages whose source post was removed or renamed."""
+        for output in self.stale_outputs:
+            if self.delete_output(output):
+                print(f"🗑️  Removed: {output}")
+
+    def remove_listing_pages(self):
+        """Delete the index, tag pages and feed once no posts are left.
+
+        Files on disk are removed as well as those in the manifest, so a
+        --full build (which ignores the manifest) cleans up too.
+        """
+        previous_pages = self.manifest.get('pages', [])
+        outputs = {'index.html', 'feed.xml'}
+        outputs.update(self.page_path(number) for number in range(2, len(previous_pages) + 1))
+        outputs.update(f"tags/{tag_slug}.html" for tag_slug in self.manifest.get('tags', {}))
+        for directory in ('page', 'tags'):
+            outputs.update(f"{directory}/{path.name}" for path in (self.output_dir / directory).glob('*.html'))
+        
+        for output in sorted(outputs):
+            if self.delete_output(output):
+                print(f"🗑️  Removed: {output}")
+        self.page_keys = []
+        self.tag_keys = {}
+        self.feed_key = None
+
+    def write_post_page(self, post):
+        """Render and write a single post page; returns True if the file changed."""
+        post_template = self.engine.get_template('post.html')
         posts_dir = self.output_dir / 'posts'
         posts_dir.mkdir(parents=True, exist_ok=True)
         
-        for post in self.posts:
+        with self.profiler.stage('template', post.filename):
             html_content = post_template.render(post=post)
-            post_file = posts_dir / f"{post['slug']}.html"
-            
-            with open(post_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+        post_file = posts_dir / f"{post.slug}.html"
+        
+        with self.profiler.stage('write', post.filename) as timer:
+            changed, timer.bytes = write_if_changed(post_file, html_content)
+        return changed
+
+    def generate_post_pages(self):
+        """Generate individual post HTML pages."""
+        # Streaming builds already wrote each page right after converting it
+        if self.stream:
+            return
+        
+        for post in self.posts:
+            if post.changed and self.write_post_page(post):
+                self.changed_files.append(f"posts/{post.slug}.html")
+
+    def page_path(self, number):
+        """Output path of an index page, relative to the output directory."""
+        return 'index.html' if number == 1 else f'page/{number}.html'
 
     def generate_index_page(self):
-        """Generate the main blog index page."""
-        index_template = Template("""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>My Blog</title>
-    <link rel="stylesheet" href="styles.css">
-</head>
-<body>
-    <header>
-        <h1>📝 My Blog</h1>
-        <p>Welcome to my personal blog</p>
-    </header>
-    
-    <main>
-        <div class="posts-list">
-            {% for post in posts %}
-            <article class="post-preview">
-                <h2><a href="posts/{{ post.slug }}.html">{{ post.title }}</a></h2>
-                <div class="post-meta">
-                    <span class="date">{{ post.date }}</span>
-                    <span class="author">by {{ post.author }}</span>
-                    {% if post.tags %}
-                    <div class="tags">
-                        {% for tag in post.tags %}
-                        <span class="tag">{{ tag }}</span>
-                        {% endfor %}
-                    </div>
-                    {% endif %}
-                </div>
-                <div class="post-excerpt">
-                    {{ post.content[:200] | striptags }}...
-                </div>
-                <a href="posts/{{ post.slug }}.html" class="read-more">Read more →</a>
-            </article>
-            {% endfor %}
-        </div>
-    </main>
-</body>
-</html>
-        """)
+        """Generate the paginated blog index, rewriting only pages that changed."""
+        page_size = self.page_size or len(self.posts)
+        total = max(1, -(-len(self.posts) // page_size))
+        previous_keys = self.manifest.get('pages', [])
+        index_template = None
+        written = 0
+        self.page_keys = []
+        
+        for number in range(1, total + 1):
+            posts = self.posts[(number - 1) * page_size:number * page_size]
+            page = {
+                'number': number,
+                'total': total,
+                'previous': self.page_path(number - 1) if number > 1 else None,
+                'next': self.page_path(number + 1) if number < total else None,
+            }
+            key = self.page_key(page, posts)
+            self.page_keys.append(key)
+            
+            page_file = self.output_dir / self.page_path(number)
+            if (not self.full_build and number <= len(previous_keys)
+                    and previous_keys[number - 1] == key and page_file.exists()):
+                continue
+            
+            if index_template is None:
+                index_template = self.engine.get_template('index.html')
+            
+            # Stream the rendered page to disk instead of building it in memory
+            with self.profiler.stage('template') as timer:
+                changed, timer.bytes = self.write_output(
+                    self.page_path(number),
+                    index_template.generate(posts=posts, page=page, root='' if number == 1 else '../')
+                )
+            written += changed
         
-        html_content = index_template.render(posts=self.posts)
-        index_file = self.output_dir / 'index.html'
+        # Drop pages past the new last page
+        for number in range(total + 1, len(previous_keys) + 1):
+            self.delete_output(self.page_path(number))
         
-        with open(index_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        if written:
+            print(f"🏠 Wrote {written} of {total} index pages")
+        else:
+            print("🏠 Index unchanged, skipping")
+
+    def generate_tag_pages(self):
+        """Generate one listing page per tag, rewriting only tags whose posts changed."""
+        previous_keys = self.manifest.get('tags', {})
+        tag_template = None
+        written = 0
+        self.tag_keys = {}
+        
+        for tag_slug, (tag, posts) in self.tag_index.items():
+            key = self.page_key({'number': 1, 'total': 1, 'tag': tag}, posts)
+            self.tag_keys[tag_slug] = key
+            
+            tag_file = self.output_dir / 'tags' / f"{tag_slug}.html"
+            if not self.full_build and previous_keys.get(tag_slug) == key and tag_file.exists():
+                continue
+            
+            if tag_template is None:
+                tag_template = self.engine.get_template('tag.html')
+            
+            with self.profiler.stage('template') as timer:
+                changed, timer.bytes = self.write_output(
+                    f"tags/{tag_slug}.html",
+                    tag_template.generate(tag=tag, posts=posts, root='../')
+                )
+            written += changed
+        
+        # Tags no post uses any more
+        for tag_slug in sorted(previous_keys.keys() - self.tag_keys.keys()):
+            self.delete_output(f"tags/{tag_slug}.html")
+        
+        print(f"🏷️  Wrote {written} of {len(self.tag_index)} tag pages")
+
+    def generate_feed(self):
+        """Generate an Atom feed of the latest posts."""
+        posts = self.posts[:self.feed_size]
+        self.feed_key = self.page_key({'number': 1, 'total': 1, 'base_url': self.base_url}, posts)
+        
+        feed_file = self.output_dir / 'feed.xml'
+        if not self.full_build and self.manifest.get('feed') == self.feed_key and feed_file.exists():
+            print("📡 Feed unchanged, skipping")
+            return
+        
+        feed_template = self.engine.get_template('feed.xml')
+        with self.profiler.stage('template') as timer:
+            changed, timer.bytes = self.write_output('feed.xml', feed_template.generate(
+                posts=posts,
+                base_url=self.base_url,
+                updated=atom_date(posts[0].date)
+            ))
+        if changed:
+            print(f"📡 Wrote Atom feed with {len(posts)} posts")
+        else:
+            print("📡 Feed unchanged, skipping")
 
     def generate_css(self):
         """Generate CSS styles for the blog."""
@@ -296,6 +1370,7 @@ main {
 .tag {
     background: #3498db;
     color: white;
+    text-decoration: none;
     padding: 0.2rem 0.5rem;
     border-radius: 3px;
     font-size: 0.8rem;
@@ -316,6 +1391,15 @@ main {
     text-decoration: underline;
 }
 
+.pagination {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    margin-top: 2rem;
+    border-radius: 8px;
+    color: white;
+}
+
 .post-content {
     background: white;
     padding: 2rem;
@@ -378,48 +1462,197 @@ main {
 }
         """
         
-        css_file = self.output_dir / 'styles.css'
-        with open(css_file, 'w', encoding='utf-8') as f:
-            f.write(css_content)
+        with self.profiler.stage('write') as timer:
+            _, timer.bytes = self.write_output('styles.css', css_content)
 
     def generate_blog(self):
         """Generate the complete blog."""
         print("🚀 Starting blog generation...")
+        self.profiler.reset()
         
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Load the previous build state (empty for full builds)
+        self.manifest = self.load_manifest()
+        self.manifest_entries = {}
+        self.posts = []
+        self.changed_files = []
+        self.deleted_files = []
+        
         # Process posts
         self.process_posts()
+        self.remove_stale_outputs()
         
         if not self.posts:
             print("❌ No posts to generate!")
+            self.remove_listing_pages()
+            self.save_manifest()
+            self.save_change_lists()
             return
         
         # Generate pages
         print("📄 Generating post pages...")
         self.generate_post_pages()
         
-        print("🏠 Generating index page...")
+        print("🏠 Generating index pages...")
         self.generate_index_page()
         
+        print("🏷️  Generating tag pages and feed...")
+        self.generate_tag_pages()
+        self.generate_feed()
+        
         print("🎨 Generating CSS...")
         self.generate_css()
         
+        self.save_manifest()
+        self.save_change_lists()
+        self.engine.highlight_cache.evict()
+        
+        rebuilt = sum(1 for post in self.posts if post.changed)
         print(f"✅ Blog generated successfully!")
         print(f"📁 Output directory: {self.output_dir}")
-        print(f"📊 Generated {len(self.posts)} posts")
+        print(f"📊 Generated {len(self.posts)} posts ({rebuilt} rebuilt)")
+        print(f"📝 {len(self.changed_files)} files changed, {len(self.deleted_files)} removed")
+        self.print_engine_summary()
+        
+        if self.profiler.enabled:
+            self.print_profile()
+
+    def print_profile(self):
+        """Print the per-stage report and optionally save it as JSON."""
+        self.profiler.print_report(self.profile_top)
+        if self.profile_json:
+            settings = {
+                'posts': len(self.posts),
+                'rebuilt': sum(1 for post in self.posts if post.changed),
+                'jobs': self.jobs,
+                'stream': self.stream,
+                'full_build': self.full_build,
+                'page_size': self.page_size,
+            }
+            with open(self.profile_json, 'w', encoding='utf-8') as f:
+                json.dump(self.profiler.report(self.profile_top, settings), f, indent=2)
+            print(f"💾 Profile report saved to {self.profile_json}")
+
+    def save_change_lists(self):
+        """Write changed and deleted output paths, one per line, for deploy tooling."""
+        for list_file, paths in ((self.changed_list, self.changed_files), (self.deleted_list, self.deleted_files)):
+            if list_file:
+                with open(list_file, 'w', encoding='utf-8') as f:
+                    f.writelines(f"{path}\n" for path in paths)
+
+    def print_engine_summary(self):
+        """Report converter reuse, template cache hits and the time they saved."""
+        stats = self.engine.stats
+        print(f"⚡ {stats['conversions']} posts converted with {stats['converters']} Markdown converter(s), "
+              f"{stats['template_cache_hits']}/{stats['template_loads']} templates from bytecode cache "
+              f"(~{self.engine.time_saved() * 1000:.1f} ms saved)")
+        cache = self.engine.highlight_cache
+        print(f"🖍️  Highlight cache: {cache.hits} hits, {cache.misses} misses")
+
+    def watch(self, port=8000):
+        """Serve the output directory and rebuild whenever a post changes."""
+        self.generate_blog()
+        # Later rebuilds are incremental even if the first one was forced
+        self.full_build = False
+        
+        handler = partial(QuietRequestHandler, directory=str(self.output_dir))
+        server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        
+        watcher = make_watcher(self.source_dir)
+        print(f"🌐 Serving {self.output_dir} at http://127.0.0.1:{port}/")
+        print(f"👀 Watching {self.source_dir} ({type(watcher).__name__}), press Ctrl+C to stop")
+        
+        try:
+            while True:
+                changed = watcher.changes(timeout=3600)
+                if not changed:
+                    continue
+                
+                # Debounce: keep collecting until the burst of saves goes quiet
+                while True:
+                    more = watcher.changes(timeout=WATCH_DEBOUNCE)
+                    if not more:
+                        break
+                    changed |= more
+                
+                start = time.perf_counter()
+                self.generate_blog()
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"🔄 Rebuilt after changes to {', '.join(sorted(changed))} in {elapsed:.0f} ms")
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+        finally:
+            server.shutdown()
+
+class QuietRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler that does not log every request."""
+
+    def log_message(self, format, *args):
+        pass
+
+_worker_generator = None
+
+def _init_worker(output_dir, cache_dir, stream, highlight_cache_mb, profile):
+    """Process pool initializer: one generator (and render engine) per worker."""
+    global _worker_generator
+    _worker_generator = BlogGenerator(output_dir=output_dir, cache_dir=cache_dir, stream=stream,
+                                      highlight_cache_mb=highlight_cache_mb, profile=profile)
+
+def _render_batch(batch):
+    """Process pool entry point: render a batch with the worker's generator."""
+    results = _worker_generator.render_batch(batch)
+    # Workers exit without running cleanup, so persist new highlights per batch
+    _worker_generator.engine.highlight_cache.flush()
+    profiler = _worker_generator.profiler
+    profile = profiler.drain() if profiler.enabled else None
+    return os.getpid(), _worker_generator.engine.snapshot_stats(), profile, results
 
 def main():
     parser = argparse.ArgumentParser(description="Generate a static blog from Markdown files")
     parser.add_argument('--source', '-s', default='posts', help='Source directory for markdown files')
     parser.add_argument('--output', '-o', default='output', help='Output directory for generated blog')
+    parser.add_argument('--full', action='store_true', help='Ignore the build manifest and rebuild every post')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Worker processes for Markdown conversion (0 = all cores)')
+    parser.add_argument('--cache-dir', default='.blog-cache', help='Directory for build caches such as compiled templates')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='Posts per index page (0 = single page)')
+    parser.add_argument('--stream', action='store_true', help='Write each post page as soon as it is converted to bound memory use')
+    parser.add_argument('--highlight-cache-mb', type=int, default=DEFAULT_HIGHLIGHT_CACHE_MB,
+                        help='Size limit of the syntax highlighting cache in MB')
+    parser.add_argument('--feed-size', type=int, default=DEFAULT_FEED_SIZE, help='Number of latest posts in feed.xml')
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help='Public URL of the blog, used for feed links')
+    parser.add_argument('--profile', action='store_true', help='Print wall/CPU time and bytes per build stage and the slowest posts')
+    parser.add_argument('--profile-top', type=int, default=10, help='Number of slowest posts to report with --profile')
+    parser.add_argument('--profile-json', metavar='FILE', help='Save the profile report as JSON (implies --profile)')
+    parser.add_argument('--cprofile', metavar='FILE', help='Run the build under cProfile and save the stats to FILE')
+    parser.add_argument('--changed-files', metavar='FILE', help='Write the output paths that changed in this build to FILE')
+    parser.add_argument('--deleted-files', metavar='FILE', help='Write the output paths removed in this build to FILE')
+    parser.add_argument('--watch', '-w', action='store_true', help='Rebuild on changes and serve the output directory locally')
+    parser.add_argument('--port', type=int, default=8000, help='Port for the --watch development server')
     
     args = parser.parse_args()
+    if args.page_size < 0:
+        parser.error("--page-size must be 0 or more")
+    if args.feed_size < 1:
+        parser.error("--feed-size must be at least 1")
     
-    generator = BlogGenerator(args.source, args.output)
-    generator.generate_blog()
+    generator = BlogGenerator(args.source, args.output, full_build=args.full, jobs=args.jobs,
+                              cache_dir=args.cache_dir, page_size=args.page_size, stream=args.stream,
+                              highlight_cache_mb=args.highlight_cache_mb, feed_size=args.feed_size,
+                              base_url=args.base_url, profile=args.profile, profile_top=args.profile_top,
+                              profile_json=args.profile_json, changed_list=args.changed_files,
+                              deleted_list=args.deleted_files)
+    if args.watch:
+        generator.watch(args.port)
+    elif args.cprofile:
+        profiler = cProfile.Profile()
+        profiler.runcall(generator.generate_blog)
+        profiler.dump_stats(args.cprofile)
+        print(f"💾 cProfile stats saved to {args.cprofile} (view with: python -m pstats {args.cprofile})")
+    else:
+        generator.generate_blog()
 
 if __name__ == "__main__":
     main()
-        """
\ No newline at end of file
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+import sys
+import markdown
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from blog_generator import MARKDOWN_EXTENSIONS, RenderEngine
+
+# Code blocks whose options live outside the stashed HTML
+CASES = {
+    'fenced': "```python\nx = 1\n```\n",
+    'fenced without language': "```\nx = 1\n```\n",
+    'fenced hl_lines': '```python hl_lines="2"\nx = 1\ny = 2\n```\n',
+    'fenced extra classes': "```{.python .extra}\nx = 1\n```\n",
+    'fenced attributes': '```{.python .extra hl_lines="2" linenums="1"}\nx = 1\ny = 2\n```\n',
+    'fenced use_pygments off': '```{.python use_pygments=false}\nx = 1\n```\n',
+    'indented': "    x = 1\n",
+    'indented shebang': "    #!python\n    x = 1\n",
+    'indented colons with hl_lines': '    :::python hl_lines="1"\n    x = 1\n    y = 2\n',
+    'raw html': '<pre><code class="language-python">x = 1</code></pre>\n',
+    'mixed': 'Text\n\n    :::c\n    int x;\n\n```sql\nSELECT 1;\n```\n\n    #!python\n    y = 2\n',
+}
+
+class HighlightCheck:
+    def __init__(self):
+        self.failures = []
+        self.engine = RenderEngine()
+
+    def check(self, name, condition):
+        print(f"   {'✅' if condition else '❌'} {name}")
+        if not condition:
+            self.failures.append(name)
+
+    def run(self):
+        """Cached highlighting gives the same HTML as codehilite itself, cold and warm."""
+        print("\n🔍 Cached highlighting matches codehilite")
+        for name, text in CASES.items():
+            expected = markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS)
+            cold = self.engine.convert(text)
+            warm = self.engine.convert(text)
+            self.check(name, cold == expected and warm == expected)
+        return not self.failures
+
+def main():
+    if not HighlightCheck().run():
+        print("\n❌ Highlight checks failed")
+        sys.exit(1)
+    print("\n✅ All highlight checks passed")
+
+if __name__ == "__main__":
+    main()